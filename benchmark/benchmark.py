@@ -0,0 +1,275 @@
+import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import argparse
+import json
+import subprocess
+import time
+import tracemalloc
+from collections import defaultdict
+import numpy as np
+from common.mazeworld import MazeWorld
+from common.maze_generator import generate_maze
+from common.shortest_path import (
+    distance_to_goal,
+    heuristic_q,
+    is_optimal_policy,
+    policy_optimality,
+)
+from common.trainer import episode_runner
+from q_learning.q_learning import QLearningAgent
+from q_learning.dyna_q import DynaQAgent
+from q_learning.q_lambda import QLambdaAgent
+from temporal_difference.sarsa import SARSAAgent
+from temporal_difference.sarsa_lambda import SARSALambdaAgent
+from temporal_difference.sarsa_off_policy import SARSAOffPolicyAgent
+from temporal_difference.td_eval import TDAgent
+from temporal_difference.td_n_step import TDNStepAgent
+from monte_carlo_method.mc_control import MCAgent
+from monte_carlo_method.mc_control_off_policy import MCOFFPolicyAgent
+from monte_carlo_method.mc_eval import RandomAgent
+from dynamic_programming import dp_array
+from dynamic_programming.value_iter import value_iter
+from dynamic_programming.policy_iter import policy_iter
+
+# 비교 기준이 바뀌지 않도록 고정된 미로 집합: (세로, 가로, 알고리즘, braid 비율, 시드)
+MAZES = [
+    (8, 8, "backtracker", 0.2, 0),
+    (12, 12, "kruskal", 0.2, 1),
+    (16, 16, "prim", 0.2, 2),
+]
+
+# 제어(Q를 학습) 에이전트와 평가(무작위 정책의 V를 학습) 에이전트
+CONTROL_AGENTS = {
+    "QLearningAgent": QLearningAgent,
+    "DynaQAgent": DynaQAgent,
+    "QLearningAgent(replay)": lambda shape: QLearningAgent(shape, replay_capacity=10000),
+    "QLambdaAgent": QLambdaAgent,
+    "SARSAAgent": SARSAAgent,
+    "SARSALambdaAgent": SARSALambdaAgent,
+    "SARSAOffPolicyAgent": SARSAOffPolicyAgent,
+    "MCAgent": MCAgent,
+    "MCOFFPolicyAgent": MCOFFPolicyAgent,
+}
+# 최단 거리로 계산한 Q(shortest_path.heuristic_q)로 초기화하는 제어 에이전트
+HEURISTIC_AGENTS = {
+    "QLearningAgent(heuristic)": QLearningAgent,
+    "SARSAAgent(heuristic)": SARSAAgent,
+}
+PREDICTION_AGENTS = {
+    "TDAgent": TDAgent,
+    "TDNStepAgent": TDNStepAgent,
+    "RandomAgent": RandomAgent,
+}
+
+DP_SOLVERS = {
+    "value_iter": lambda env, gamma: value_iter(
+        defaultdict(lambda: 0), env, gamma, is_render=False
+    ),
+    "value_iter_prioritized": lambda env, gamma: value_iter(
+        defaultdict(lambda: 0), env, gamma, is_render=False, prioritized=True
+    ),
+    "policy_iter": lambda env, gamma: policy_iter(env, gamma, is_render=False),
+    "policy_iter_exact": lambda env, gamma: policy_iter(env, gamma, is_render=False, exact=True),
+    "dp_array.value_iter": lambda env, gamma: dp_array.value_iter(None, env, gamma, is_render=False),
+    "dp_array.policy_iter": lambda env, gamma: dp_array.policy_iter(env, gamma, is_render=False),
+    "dp_array.policy_iter_exact": lambda env, gamma: dp_array.policy_iter(
+        env, gamma, is_render=False, exact=True
+    ),
+}
+
+
+def v_to_array(env, V):  # dict 또는 배열 V를 (S,) 배열로 변환
+    if isinstance(V, np.ndarray):
+        return V.ravel()
+    return np.array([V[state] if state in V else 0.0 for state in env.states()])
+
+
+def value_updates(agent, steps):  # 학습 중 가치(Q 또는 V) 원소를 갱신한 횟수
+    traces = getattr(agent, "traces", None)
+    if traces is not None:  # λ 에이전트: 스텝마다 흔적이 남은 모든 원소
+        return traces.updates
+    updates = steps  # 환경 한 스텝에 한 번(몬테카를로는 에피소드 끝에 걸음 수만큼)
+    if hasattr(agent, "planning_steps"):  # Dyna: 스텝마다 모델로 planning_steps번 더
+        updates += steps * agent.planning_steps
+    if getattr(agent, "replay", None) is not None:  # 경험 재생: replay_every 스텝마다 batch_size개
+        # 버퍼가 batch_size만큼 차기 전의 몇 번은 건너뛰므로 근사값
+        updates += agent.replay_steps // agent.replay_every * agent.batch_size
+    return updates
+
+
+def peak_memory(function):  # 함수 실행 중 최대 메모리 사용량(byte)
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_env(env, steps=100000):  # 무작위 행동에 대한 env.step 처리량
+    actions = np.random.randint(len(env.actions()), size=steps).tolist()
+    env.reset()
+
+    start_time = time.perf_counter()
+    for action in actions:
+        _, _, done = env.step(action)
+        if done:
+            env.reset()
+    return steps / (time.perf_counter() - start_time)
+
+
+def benchmark_agent(name, env, episodes, check_every, max_steps, memory_episodes):
+    is_control = name in CONTROL_AGENTS or name in HEURISTIC_AGENTS
+    if name in HEURISTIC_AGENTS:
+        agent_class = HEURISTIC_AGENTS[name]
+        initial_q = heuristic_q(env, agent_class(env.shape).gamma, distance_to_goal(env))
+        make_agent = lambda: agent_class(env.shape, initial_q=initial_q)
+    else:
+        agent_class = CONTROL_AGENTS[name] if is_control else PREDICTION_AGENTS[name]
+        make_agent = lambda: agent_class(env.shape)
+
+    if is_control:
+        distance = distance_to_goal(env)
+    else:  # 평가 에이전트는 무작위 정책의 정확한 V와 비교
+        action_size = len(env.actions())
+        uniform = np.full((env.state_size, action_size), 1 / action_size)
+        true_V = dp_array.policy_eval_exact(uniform, env, agent_class(env.shape).gamma)
+
+    agent = make_agent()
+    run_episode = episode_runner(agent)
+    total_steps, train_time = 0, 0.0
+    converged_episode, converged_time = None, None
+
+    for episode in range(episodes):
+        start_time = time.perf_counter()
+        steps, _ = run_episode(env, agent, max_steps)
+        train_time += time.perf_counter() - start_time
+        total_steps += steps
+
+        # 수렴 검사(학습 시간에는 포함하지 않음)
+        if converged_episode is None and (episode + 1) % check_every == 0:
+            if is_control:
+                converged = is_optimal_policy(env, agent.Q.greedy_actions(), distance)
+            else:
+                V = v_to_array(env, agent.V)
+                if isinstance(agent.V, dict):
+                    visited = [env.to_index(state) for state in agent.V.keys()]
+                else:  # 배열 V는 방문 여부를 따로 기록하지 않으므로 시작에서 갈 수 있는 모든 상태와 비교
+                    visited = np.nonzero(env.reachable_table)[0]
+                converged = np.abs(V - true_V)[visited].max() < 1.0
+            if converged:
+                converged_episode, converged_time = episode + 1, train_time
+
+    def short_run():
+        memory_agent = make_agent()
+        for _ in range(memory_episodes):
+            run_episode(env, memory_agent, max_steps)
+
+    # optimal_action_ratio: 목표에 갈 수 있는 칸 중 학습이 끝난 그리디 행동이 최적인 칸의 비율(제어 에이전트만)
+    return {
+        "agent": name,
+        "episodes": episodes,
+        "env_steps": total_steps,
+        "wall_time": train_time,
+        "steps_per_sec": total_steps / train_time,
+        "updates_per_sec": value_updates(agent, total_steps) / train_time,
+        "episodes_to_convergence": converged_episode,
+        "time_to_convergence": converged_time,
+        "optimal_action_ratio": (
+            policy_optimality(env, agent.Q.greedy_actions(), distance) if is_control else None
+        ),
+        "peak_memory_bytes": peak_memory(short_run),
+    }
+
+
+def benchmark_dp(name, env, gamma):
+    solver = DP_SOLVERS[name]
+
+    start_time = time.perf_counter()
+    result = solver(env, gamma)
+    wall_time = time.perf_counter() - start_time
+
+    if name.endswith("value_iter") or name.endswith("prioritized"):
+        actions = dp_array.greedy_policy(v_to_array(env, result), env, gamma)
+    elif isinstance(result, np.ndarray):
+        actions = result.ravel()
+    else:  # dict 정책
+        actions = np.array([max(result[state], key=result[state].get) for state in env.states()])
+
+    return {
+        "solver": name,
+        "wall_time": wall_time,
+        "optimal": is_optimal_policy(env, actions),
+        "peak_memory_bytes": peak_memory(lambda: solver(env, gamma)),
+    }
+
+
+def git_commit():  # 결과를 커밋별로 비교할 수 있도록 현재 커밋 기록
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(__file__), text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every agent and DP solver on fixed mazes.")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--episodes", type=int, default=500)
+    parser.add_argument("--check-every", type=int, default=10)
+    parser.add_argument("--max-steps", type=int, default=None, help="per-episode step limit (default: 10 * states)")
+    parser.add_argument("--memory-episodes", type=int, default=20)
+    parser.add_argument("--gamma", type=float, default=0.9, help="discount for the DP solvers")
+    parser.add_argument(
+        "--shaping", choices=["manhattan", "distance"], default=None, help="potential-based reward shaping"
+    )
+    parser.add_argument(
+        "--shaping-gamma",
+        type=float,
+        default=0.9,
+        help="discount used by --shaping; the optimal policy is only preserved for learners with this discount "
+        "(default: the agents' gamma 0.9, independent of --gamma)",
+    )
+    parser.add_argument("--agents", nargs="*", default=[*CONTROL_AGENTS, *HEURISTIC_AGENTS, *PREDICTION_AGENTS])
+    parser.add_argument("--solvers", nargs="*", default=list(DP_SOLVERS))
+    args = parser.parse_args()
+
+    results = {"commit": git_commit(), "created": time.time(), "config": vars(args), "mazes": []}
+    for height, width, algorithm, braid_factor, seed in MAZES:
+        env = MazeWorld(
+            **generate_maze(height, width, algorithm, braid_factor, seed),
+            shaping=args.shaping,
+            shaping_gamma=args.shaping_gamma,
+        )
+        max_steps = args.max_steps or 10 * env.state_size
+        print(f"maze {height}x{width} ({algorithm}, seed {seed})")
+
+        maze_result = {
+            "height": height,
+            "width": width,
+            "algorithm": algorithm,
+            "braid_factor": braid_factor,
+            "seed": seed,
+            "env_steps_per_sec": benchmark_env(env),
+            "agents": [],
+            "dp": [],
+        }
+        for name in args.agents:
+            result = benchmark_agent(
+                name, env, args.episodes, args.check_every, max_steps, args.memory_episodes
+            )
+            maze_result["agents"].append(result)
+            print(f"  {name}: {result['steps_per_sec']:.0f} steps/s, converged at {result['episodes_to_convergence']}")
+        for name in args.solvers:
+            result = benchmark_dp(name, env, args.gamma)
+            maze_result["dp"].append(result)
+            print(f"  {name}: {result['wall_time']:.3f}s, optimal={result['optimal']}")
+
+        results["mazes"].append(maze_result)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
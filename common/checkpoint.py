@@ -0,0 +1,163 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import json
+import os
+from collections import defaultdict
+import numpy as np
+from common.policy import GreedyPolicy
+from common.q_table import QTable
+from common.replay_buffer import ReplayBuffer
+
+# 에이전트의 학습 상태를 하나의 .npz 파일(압축하지 않은 배열 묶음)로 저장하고 복원.
+# 에이전트마다 저장 코드를 두지 않고 속성의 종류를 보고 배열로 변환:
+#   QTable, np.ndarray       -> 배열 그대로
+#   상태 -> 값 dict(V 등)      -> 상태 (N, 2) 배열과 값 (N,) 배열
+#   상태 -> 행동 확률 dict(pi, b) -> 상태 (N, 2) 배열과 확률 (N, A) 배열
+#   수, bool(하이퍼파라미터)    -> 0차원 배열
+#   np.random.Generator      -> 난수 상태를 JSON 문자열로
+#   GreedyPolicy             -> 그리디 행동 배열, 난수 상태, 미리 뽑아 둔 난수와 위치
+#   ReplayBuffer             -> 전이 배열들, 쓰기 위치와 저장된 개수, 난수 상태
+# 에피소드 중에만 쓰는 memory 같은 list/deque와 EligibilityTraces(적격 흔적)는 저장하지 않음.
+# 체크포인트는 에피소드 사이에 저장하고 에이전트의 reset이 에피소드 시작마다 이들을 비우므로 이어서 학습해도 결과가 같음.
+# 전역 난수(np.random)의 상태와 에피소드 수도 함께 저장함
+
+
+def _is_probs(value):  # 상태 -> {행동: 확률} dict 여부
+    return len(value) > 0 and isinstance(next(iter(value.values())), dict)
+
+
+def save_checkpoint(path, agent, episode=0):
+    arrays = {"episode": np.array(episode)}
+
+    for name, value in vars(agent).items():
+        if isinstance(value, QTable):
+            arrays[f"qtable:{name}"] = value.table
+        elif isinstance(value, np.ndarray):
+            arrays[f"array:{name}"] = value
+        elif isinstance(value, np.random.Generator):
+            arrays[f"generator:{name}"] = np.array(json.dumps(value.bit_generator.state))
+        elif isinstance(value, GreedyPolicy):
+            arrays[f"policy:{name}"] = value.greedy
+            arrays[f"policy_rng:{name}"] = np.array(json.dumps(value.rng.bit_generator.state))
+            arrays[f"policy_uniforms:{name}"] = np.array(value.uniforms)
+            arrays[f"policy_actions:{name}"] = np.array(value.random_actions)
+            arrays[f"policy_cursor:{name}"] = np.array(value.cursor)
+        elif isinstance(value, ReplayBuffer):
+            arrays[f"buffer:{name}"] = np.array([value.index, value.size])
+            arrays[f"buffer_rng:{name}"] = np.array(json.dumps(value.rng.bit_generator.state))
+            for field in ReplayBuffer.FIELDS:
+                arrays[f"buffer_{field}:{name}"] = getattr(value, field)
+        elif isinstance(value, dict) and _is_probs(value):
+            arrays[f"probs_keys:{name}"] = np.array(list(value.keys()), dtype=np.int64)
+            arrays[f"probs_values:{name}"] = np.array(
+                [[probs[action] for action in sorted(probs)] for probs in value.values()]
+            )
+        elif isinstance(value, dict):
+            arrays[f"values_keys:{name}"] = np.array(list(value.keys()), dtype=np.int64).reshape(-1, 2)
+            arrays[f"values_values:{name}"] = np.array(list(value.values()), dtype=float)
+        elif isinstance(value, (bool, int, float, np.number)):
+            arrays[f"param:{name}"] = np.array(value)
+
+    # 전역 난수 상태: ('MT19937', 키, 위치, has_gauss, cached_gaussian)
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    arrays["random:keys"] = keys
+    arrays["random:rest"] = np.array([pos, has_gauss, cached_gaussian], dtype=float)
+
+    # 저장 중에 중단되어도 이전 체크포인트가 남도록 임시 파일에 쓴 뒤 교체
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(temp_path, path)
+
+
+def _restore_dict(agent, name, items):  # 기본값 함수(defaultdict)를 유지한 채 내용만 교체
+    target = getattr(agent, name, None)
+    if isinstance(target, dict):
+        target.clear()
+        target.update(items)
+    else:
+        setattr(agent, name, defaultdict(lambda: 0, items))
+
+
+def load_checkpoint(path, agent):
+    # agent에 저장된 상태를 복원하고 저장 당시의 에피소드 수를 반환
+    with np.load(path) as data:
+        for key in data.files:
+            kind, _, name = key.partition(":")
+            value = data[key]
+
+            if kind == "qtable":
+                agent_table = getattr(agent, name, None)
+                if isinstance(agent_table, QTable) and agent_table.shape != value.shape[:-1]:
+                    raise ValueError(f"{name} shape {value.shape[:-1]} does not match the agent")
+                setattr(agent, name, QTable(value.shape[:-1], value.shape[-1], value))
+            elif kind == "array":
+                setattr(agent, name, value)
+            elif kind == "generator":
+                generator = np.random.default_rng()
+                generator.bit_generator.state = json.loads(str(value))
+                setattr(agent, name, generator)
+            elif kind == "policy":
+                policy = getattr(agent, name)
+                if policy.greedy.shape != value.shape:
+                    raise ValueError(f"{name} shape {value.shape} does not match the agent")
+                policy.greedy = value
+                policy.rng.bit_generator.state = json.loads(str(data[f"policy_rng:{name}"]))
+                policy.uniforms = data[f"policy_uniforms:{name}"].tolist()
+                policy.random_actions = data[f"policy_actions:{name}"].tolist()
+                policy.block_size = len(policy.uniforms)
+                policy.cursor = int(data[f"policy_cursor:{name}"])
+            elif kind == "buffer":
+                buffer = getattr(agent, name)
+                if buffer.capacity != len(data[f"buffer_states:{name}"]):
+                    raise ValueError(f"{name} capacity does not match the agent")
+                buffer.index, buffer.size = value.tolist()
+                buffer.rng.bit_generator.state = json.loads(str(data[f"buffer_rng:{name}"]))
+                for field in ReplayBuffer.FIELDS:
+                    getattr(buffer, field)[...] = data[f"buffer_{field}:{name}"]
+            elif kind == "probs_keys":
+                probs = data[f"probs_values:{name}"]
+                _restore_dict(
+                    agent,
+                    name,
+                    {
+                        tuple(state): dict(enumerate(row))
+                        for state, row in zip(value.tolist(), probs.tolist())
+                    },
+                )
+            elif kind == "values_keys":
+                values = data[f"values_values:{name}"]
+                _restore_dict(
+                    agent,
+                    name,
+                    {tuple(state): v for state, v in zip(value.tolist(), values.tolist())},
+                )
+            elif kind == "param":
+                setattr(agent, name, value.item())
+
+        pos, has_gauss, cached_gaussian = data["random:rest"]
+        np.random.set_state(
+            ("MT19937", data["random:keys"], int(pos), int(has_gauss), cached_gaussian)
+        )
+        return int(data["episode"])
+
+
+if __name__ == "__main__":
+    import tempfile
+    from common.mazeworld import MazeWorld
+    from common.trainer import train
+    from q_learning.q_learning import QLearningAgent
+
+    env = MazeWorld()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "q_learning.npz")
+
+        agent = QLearningAgent(env.shape)
+        train(env, agent, 300, checkpoint=path, checkpoint_every=100)
+
+        resumed = QLearningAgent(env.shape)
+        print("resumed from episode", load_checkpoint(path, resumed))
+        print("same Q:", np.array_equal(agent.Q.table, resumed.Q.table))
@@ -0,0 +1,71 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+
+class EligibilityTraces:
+    # 후방 관점 TD(λ)의 적격 흔적. 흔적은 가치 배열과 같은 번호(상태 번호 또는 상태 번호 * 행동 개수 + 행동)의
+    # 1차원 배열에 두고, 흔적이 남은 번호만 활성 목록으로 관리해서 한 스텝의 비용이 미로 크기가 아닌
+    # 최근에 방문한 칸 수에 비례하도록 함. 흔적이 threshold 아래로 줄어든 번호는 활성 목록에서 뺌
+    def __init__(
+        self,
+        size: int,  # 흔적 개수(가치 배열의 원소 개수)
+        replacing: bool = False,  # True면 방문 시 흔적을 1로(replacing), False면 1을 더함(accumulating)
+        threshold: float = 1e-3,  # 이보다 작아진 흔적은 0으로 버림
+    ):
+        self.replacing = replacing
+        self.threshold = threshold
+
+        self.traces = np.zeros(size)
+        self.is_active = np.zeros(size, dtype=bool)
+        self.active = []  # 흔적이 남은 번호 목록
+        self.updates = 0  # 지금까지 갱신한 가치의 개수(벤치마크용)
+
+    def __len__(self):
+        return len(self.active)
+
+    def visit(self, index):  # 방문한 번호의 흔적 증가
+        if not self.is_active[index]:
+            self.is_active[index] = True
+            self.active.append(index)
+        if self.replacing:
+            self.traces[index] = 1.0
+        else:
+            self.traces[index] += 1.0
+
+    def apply(self, values, step, decay):
+        # 흔적이 남은 모든 번호의 가치를 step(= alpha * TD 오차) * 흔적만큼 갱신하고 흔적을 decay(= gamma * λ)배로 줄임
+        # values는 1차원 배열 또는 그 뷰(제자리 갱신), 갱신한 번호 배열을 반환
+        indices = np.array(self.active, dtype=np.int64)
+        traces = self.traces[indices]
+        values[indices] += step * traces
+        self.updates += len(indices)
+
+        traces *= decay
+        self.traces[indices] = traces
+        keep = traces >= self.threshold
+        if not keep.all():
+            dropped = indices[~keep]
+            self.traces[dropped] = 0.0
+            self.is_active[dropped] = False
+            self.active = indices[keep].tolist()
+        return indices
+
+    def clear(self):  # 모든 흔적 제거(에피소드 시작, Watkins Q(λ)의 탐험 행동)
+        if self.active:
+            indices = np.array(self.active, dtype=np.int64)
+            self.traces[indices] = 0.0
+            self.is_active[indices] = False
+            self.active = []
+
+
+if __name__ == "__main__":
+    traces = EligibilityTraces(10)
+    values = np.zeros(10)
+    for index in (1, 2, 1, 3):
+        traces.visit(index)
+        traces.apply(values, 0.1, 0.5)
+    print(values.round(4), sorted(traces.active))
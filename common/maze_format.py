@@ -0,0 +1,97 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import struct
+import numpy as np
+
+# 미로는 칸마다 이동할 수 있는 방향을 비트로 표시한 (세로, 가로) uint8 배열로 다룸
+# (행동 a 방향으로 이동할 수 있으면 1 << a 비트가 켜짐, 행동은 MazeWorld와 같이 0: 위, 1: 아래, 2: 왼쪽, 3: 오른쪽)
+#
+# 파일 형식: 고정 길이 헤더 뒤에 칸 배열을 행 우선으로 그대로 저장하므로 np.memmap으로 바로 열 수 있음
+#   헤더: 식별자 b"MAZE", 버전, 헤더 길이, 세로, 가로, 시작/목표/실패 지점의 (행, 열)
+#   지정하지 않은 지점은 (-1, -1)로 저장
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII6i")
+POINTS = ("start", "goal", "end")
+
+
+def to_mask(directions: list[list[list[int]]]) -> np.ndarray:  # MazeWorld의 directions 형식에서 변환
+    mask = np.zeros((len(directions), len(directions[0])), dtype=np.uint8)
+    for row, cells in enumerate(directions):
+        for col, actions in enumerate(cells):
+            for action in actions:
+                mask[row, col] |= 1 << action
+    return mask
+
+
+def to_directions(mask: np.ndarray) -> list[list[list[int]]]:  # MazeWorld의 directions 형식으로 변환
+    # 같은 비트 조합의 칸들은 같은 리스트 객체를 공유(수정하지 말 것)
+    direction_map = [[a for a in range(4) if m >> a & 1] for m in range(16)]
+    return [[direction_map[m] for m in row] for row in np.asarray(mask).tolist()]
+
+
+def to_movable(mask: np.ndarray) -> np.ndarray:  # 칸, 행동별 이동 가능 여부, (세로, 가로, 4) bool
+    return (np.asarray(mask)[..., None] >> np.arange(4, dtype=np.uint8)) & 1 == 1
+
+
+def save_maze(
+    path,
+    mask: np.ndarray,
+    start: tuple[int, int] = None,
+    goal: tuple[int, int] = None,
+    end: tuple[int, int] = None,
+) -> None:
+    mask = np.ascontiguousarray(mask, dtype=np.uint8)
+    height, width = mask.shape
+    points = []
+    for point in (start, goal, end):
+        points.extend((-1, -1) if point is None else point)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, HEADER.size, height, width, *points))
+        mask.tofile(f)
+
+
+def load_maze(path, mmap: bool = True) -> dict:
+    # MazeWorld(**load_maze(path))로 바로 사용할 수 있는 데이터
+    # (지정하지 않은 지점은 None이며, 그런 파일은 MazeWorld가 빠진 지점을 알려 주는 ValueError를 냄)
+    # mmap이면 칸 배열을 읽지 않고 읽기 전용 np.memmap으로 연결
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or header[:4] != MAGIC:
+        raise ValueError(f"{path} is not a maze file")
+
+    magic, version, header_size, height, width, *points = HEADER.unpack(header)
+    if version > VERSION:
+        raise ValueError(f"unsupported maze file version {version}")
+
+    if mmap:
+        mask = np.memmap(path, dtype=np.uint8, mode="r", offset=header_size, shape=(height, width))
+    else:
+        mask = np.fromfile(path, dtype=np.uint8, count=height * width, offset=header_size)
+        mask = mask.reshape(height, width)
+
+    data = {"mask": mask}
+    for name, row, col in zip(POINTS, points[::2], points[1::2]):
+        data[name] = None if row < 0 else (row, col)
+    return data
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from common.maze_generator import generate_mask
+
+    mask = generate_mask(5000, 5000, "kruskal", seed=0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "maze.bin")
+        save_maze(path, mask, (0, 0), (4999, 4999), (0, 4999))
+        print(f"{os.path.getsize(path) / 1e6:.1f} MB on disk")
+
+        start_time = time.time()
+        data = load_maze(path)
+        print(f"loaded in {time.time() - start_time:.4f}s, same: {np.array_equal(data['mask'], mask)}")
+        del data
@@ -0,0 +1,312 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import random
+from collections import deque
+import numpy as np
+
+# 미로는 칸마다 이동할 수 있는 방향을 비트로 표시한 uint8 배열로 생성
+# (행동 a 방향으로 이동할 수 있으면 1 << a 비트가 켜짐, 행동은 MazeWorld와 같이 0: 위, 1: 아래, 2: 왼쪽, 3: 오른쪽)
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+OPPOSITE = [DOWN, UP, RIGHT, LEFT]
+MOVES = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+MIN_SIZE = 2  # 미로 한 변의 최소 칸 수
+MAX_ATTEMPTS = 100  # 실패 지점을 둘 곳이 없는 미로(모든 칸이 목표로 가는 외길)를 다시 생성하는 최대 횟수
+
+
+def recursive_backtracker(height: int, width: int, rng: random.Random) -> bytearray:
+    mask = bytearray(height * width)
+    visited = bytearray(height * width)
+    rand = rng.random
+
+    stack = [0]
+    visited[0] = 1
+    while stack:
+        cell = stack[-1]
+        row, col = divmod(cell, width)
+
+        # 방문하지 않은 이웃으로 가는 (행동, 이웃 칸) 후보
+        candidates = []
+        if row > 0 and not visited[cell - width]:
+            candidates.append((UP, cell - width))
+        if row < height - 1 and not visited[cell + width]:
+            candidates.append((DOWN, cell + width))
+        if col > 0 and not visited[cell - 1]:
+            candidates.append((LEFT, cell - 1))
+        if col < width - 1 and not visited[cell + 1]:
+            candidates.append((RIGHT, cell + 1))
+        if not candidates:
+            stack.pop()
+            continue
+
+        action, next_cell = candidates[int(rand() * len(candidates))]
+        mask[cell] |= 1 << action
+        mask[next_cell] |= 1 << OPPOSITE[action]
+        visited[next_cell] = 1
+        stack.append(next_cell)
+
+    return mask
+
+
+def kruskal(height: int, width: int, rng: random.Random) -> bytearray:
+    # 벽을 무작위 순서로 허무는 Kruskal 알고리즘의 결과는 무작위 가중치에 대한 최소 신장 트리와 같으므로,
+    # 같은 트리를 배열 연산으로 구할 수 있는 Boruvka 알고리즘으로 계산
+    # (각 단계에서 모든 집합이 가장 가벼운 바깥 벽을 동시에 허물고 집합을 합침)
+    cell_size = height * width
+    cells = np.arange(cell_size, dtype=np.int32).reshape(height, width)
+    u = np.concatenate((cells[:-1, :].ravel(), cells[:, :-1].ravel()))
+    v = np.concatenate((cells[1:, :].ravel(), cells[:, 1:].ravel()))
+    actions = np.concatenate(
+        (
+            np.full(width * (height - 1), DOWN, dtype=np.int8),
+            np.full(height * (width - 1), RIGHT, dtype=np.int8),
+        )
+    )
+
+    # 벽마다 서로 다른 무작위 가중치(순위)를 부여, 벽 배열은 공간 순서를 유지해 메모리 접근을 지역적으로 유지
+    weights = np.random.default_rng(rng.getrandbits(64)).permutation(len(u)).astype(np.int32)
+    edge_of_weight = np.empty(len(u), dtype=np.int32)
+
+    component = np.arange(cell_size, dtype=np.int32)
+    states = np.arange(cell_size, dtype=np.int32)
+    chosen = []
+    while len(u) > 0:
+        cu, cv = component[u], component[v]
+        cross = cu != cv
+        u, v, actions, weights = u[cross], v[cross], actions[cross], weights[cross]
+        cu, cv = cu[cross], cv[cross]
+        if len(u) == 0:
+            break
+
+        # 집합별로 가장 가벼운 바깥 벽 선택
+        best = np.full(cell_size, len(edge_of_weight), dtype=np.int32)
+        np.minimum.at(best, cu, weights)
+        np.minimum.at(best, cv, weights)
+        roots = np.flatnonzero(best < len(edge_of_weight))
+        edge_of_weight[weights] = np.arange(len(u), dtype=np.int32)
+        edges = edge_of_weight[best[roots]]
+
+        picked = np.zeros(len(u), dtype=bool)
+        picked[edges] = True
+        chosen.append(np.stack((u[picked], actions[picked]), axis=1))
+
+        # 각 집합을 선택한 벽 건너편 집합에 연결(서로를 가리키는 쌍은 작은 쪽을 루트로)
+        parent = states.copy()
+        parent[roots] = np.where(cu[edges] == roots, cv[edges], cu[edges])
+        mutual = (parent[parent] == states) & (states < parent)
+        parent[mutual] = states[mutual]
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        component = parent[component]
+
+    mask = np.zeros(cell_size, dtype=np.uint8)
+    if not chosen:  # 칸이 하나뿐인 미로
+        return bytearray(mask)
+    cells, actions = np.concatenate(chosen).T
+    offsets = np.where(actions == DOWN, width, 1)
+    np.bitwise_or.at(mask, cells, (1 << actions.astype(np.uint8)))
+    np.bitwise_or.at(mask, cells + offsets, (1 << np.array(OPPOSITE, dtype=np.uint8))[actions])
+    return bytearray(mask)
+
+
+def prim(height: int, width: int, rng: random.Random) -> bytearray:
+    mask = bytearray(height * width)
+    visited = bytearray(height * width)
+    in_frontier = bytearray(height * width)
+    rand = rng.random
+
+    def neighbors(cell):  # 미로 안에 있는 (행동, 이웃 칸)
+        row, col = divmod(cell, width)
+        result = []
+        if row > 0:
+            result.append((UP, cell - width))
+        if row < height - 1:
+            result.append((DOWN, cell + width))
+        if col > 0:
+            result.append((LEFT, cell - 1))
+        if col < width - 1:
+            result.append((RIGHT, cell + 1))
+        return result
+
+    frontier = []
+    visited[0] = 1
+    for _, next_cell in neighbors(0):
+        in_frontier[next_cell] = 1
+        frontier.append(next_cell)
+
+    while frontier:
+        # 임의의 경계 칸을 꺼내(마지막 칸과 자리를 바꿔 O(1) 삭제) 이미 방문한 이웃과 연결
+        index = int(rand() * len(frontier))
+        frontier[index], frontier[-1] = frontier[-1], frontier[index]
+        cell = frontier.pop()
+
+        candidates = []
+        for action, next_cell in neighbors(cell):
+            if visited[next_cell]:
+                candidates.append((action, next_cell))
+            elif not in_frontier[next_cell]:
+                in_frontier[next_cell] = 1
+                frontier.append(next_cell)
+
+        action, next_cell = candidates[int(rand() * len(candidates))]
+        mask[cell] |= 1 << action
+        mask[next_cell] |= 1 << OPPOSITE[action]
+        visited[cell] = 1
+
+    return mask
+
+
+ALGORITHMS = {
+    "backtracker": recursive_backtracker,
+    "kruskal": kruskal,
+    "prim": prim,
+}
+
+
+def braid(mask: np.ndarray, factor: float, rng: np.random.Generator) -> np.ndarray:
+    # 막다른 길을 factor 비율만큼 골라 벽 하나를 허물어 순환 경로를 만듦
+    height, width = mask.shape
+    mask = mask.copy()
+    rows, cols = np.indices(mask.shape)
+    bits = 1 << np.arange(4)
+
+    dead_ends = np.flatnonzero(
+        (np.unpackbits(mask[..., None], axis=-1).sum(axis=-1) == 1).ravel()
+        & (rng.random(mask.size) < factor)
+    )
+    if len(dead_ends) == 0:
+        return mask
+
+    dead_rows, dead_cols = rows.ravel()[dead_ends], cols.ravel()[dead_ends]
+    inside = np.stack(
+        (dead_rows > 0, dead_rows < height - 1, dead_cols > 0, dead_cols < width - 1), axis=1
+    )
+    closed = (mask.ravel()[dead_ends, None] & bits) == 0
+
+    # 안쪽으로 막힌 방향 중 하나를 무작위로 선택
+    keys = np.where(inside & closed, rng.random(inside.shape), -1)
+    actions = keys.argmax(axis=1)
+    valid = keys.max(axis=1) >= 0
+    dead_rows, dead_cols, actions = dead_rows[valid], dead_cols[valid], actions[valid]
+
+    moves = np.array(MOVES)[actions]
+    np.bitwise_or.at(mask, (dead_rows, dead_cols), (1 << actions).astype(np.uint8))
+    np.bitwise_or.at(
+        mask,
+        (dead_rows + moves[:, 0], dead_cols + moves[:, 1]),
+        (1 << np.array(OPPOSITE)[actions]).astype(np.uint8),
+    )
+    return mask
+
+
+def generate_mask(
+    height: int,
+    width: int,
+    algorithm: str = "backtracker",  # 생성 알고리즘(backtracker, kruskal, prim)
+    braid_factor: float = 0.0,  # 순환 경로를 만들 막다른 길의 비율(0 ~ 1)
+    seed: int = None,  # 난수 시드
+) -> np.ndarray:
+    rng = random.Random(seed)
+    mask = ALGORITHMS[algorithm](height, width, rng)
+    mask = np.frombuffer(mask, dtype=np.uint8).reshape(height, width).copy()
+
+    if braid_factor > 0:
+        mask = braid(mask, braid_factor, np.random.default_rng(rng.getrandbits(64)))
+    return mask
+
+
+def shortest_path_cells(mask: np.ndarray, start, goal) -> set[tuple[int, int]]:
+    # 시작에서 목표까지의 최단 경로 하나에 있는 칸(BFS, 목표에 갈 수 없으면 빈 집합)
+    height, width = mask.shape
+    flat = mask.ravel().tolist()
+    steps = [-width, width, -1, 1]
+    start_index, goal_index = start[0] * width + start[1], goal[0] * width + goal[1]
+
+    parent = [-1] * (height * width)  # BFS로 처음 도착했을 때의 이전 칸(-1이면 아직 방문하지 않음)
+    parent[start_index] = start_index
+    queue = deque([start_index])
+    while queue and parent[goal_index] < 0:
+        index = queue.popleft()
+        cell = flat[index]
+        for action in range(4):
+            next_index = index + steps[action]
+            if cell >> action & 1 and parent[next_index] < 0:
+                parent[next_index] = index
+                queue.append(next_index)
+
+    if parent[goal_index] < 0:
+        return set()
+    cells, index = {start}, goal_index
+    while index != start_index:
+        cells.add(divmod(index, width))
+        index = parent[index]
+    return cells
+
+
+def check_size(height: int, width: int) -> None:  # 시작, 목표, 실패 지점을 서로 다른 칸에 둘 수 있는 크기인지
+    if height < MIN_SIZE or width < MIN_SIZE:
+        raise ValueError(
+            f"maze must be at least {MIN_SIZE}x{MIN_SIZE} to place start, goal and end, got {height}x{width}"
+        )
+
+
+def place_points(mask: np.ndarray, seed: int = None) -> dict[str, tuple[int, int]]:
+    # 시작은 왼쪽 위, 목표는 오른쪽 아래, 실패 지점은 막다른 길 중 임의의 칸
+    # 실패 지점은 시작에서 목표까지의 최단 경로 하나를 BFS로 구해 그 경로 밖에서만 고르므로 목표로 가는 길을 막지 않음
+    # (막다른 길이 없으면 경로 밖의 모든 칸 중에서 고름)
+    height, width = mask.shape
+    check_size(height, width)
+    start, goal = (0, 0), (height - 1, width - 1)
+    path = shortest_path_cells(mask, start, goal) | {start, goal}
+
+    degree = np.unpackbits(mask[..., None], axis=-1).sum(axis=-1)
+    candidates = [tuple(c) for c in np.argwhere(degree == 1).tolist() if tuple(c) not in path]
+    if len(candidates) == 0:
+        candidates = [tuple(c) for c in np.argwhere(np.ones(mask.shape, dtype=bool)).tolist() if tuple(c) not in path]
+    if len(candidates) == 0:
+        raise ValueError("no cell for the end point off the path from start to goal")
+
+    end = candidates[random.Random(seed).randrange(len(candidates))]
+    return {"start": start, "goal": goal, "end": end}
+
+
+def generate_maze(
+    height: int,
+    width: int,
+    algorithm: str = "backtracker",
+    braid_factor: float = 0.0,
+    seed: int = None,
+) -> dict:  # MazeWorld(**generate_maze(...))로 바로 사용할 수 있는 데이터
+    check_size(height, width)
+
+    # 모든 칸이 시작에서 목표로 가는 외길 위에 있으면 실패 지점을 둘 곳이 없으므로 시드를 바꿔 다시 생성
+    rng = random.Random(seed)
+    for attempt in range(MAX_ATTEMPTS):
+        mask = generate_mask(height, width, algorithm, braid_factor, seed)
+        try:
+            data = place_points(mask, seed)
+            break
+        except ValueError:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            seed = rng.getrandbits(64)
+    data["mask"] = mask
+    return data
+
+
+if __name__ == "__main__":
+    import time
+    from common.mazeworld import MazeWorld
+
+    for algorithm in ALGORITHMS:
+        start_time = time.time()
+        mask = generate_mask(2000, 2000, algorithm, braid_factor=0.1, seed=0)
+        print(f"{algorithm}: 2000x2000 in {time.time() - start_time:.2f}s")
+
+    env = MazeWorld(**generate_maze(10, 10, braid_factor=0.2, seed=0))
+    env.render_v()
@@ -3,8 +3,11 @@ if "__file__" in globals():
 
     sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
+from collections import deque
 import numpy as np
 import common.mazeworld_render as render_helper
+from common.maze_format import to_mask, to_directions, to_movable, save_maze, load_maze
+from common.shortest_path import distance_to_goal
 
 ## TODO: 필요 없어진 경우 MazeWorld 기본값 제거할 것.
 DEFAULT_START = (0, 2)
@@ -25,6 +28,11 @@ class MazeWorld:
         goal: tuple[int, int] = DEFAULT_GOAL,
         end: tuple[int, int] = DEFAULT_END,
         directions: list[list[list[int]]] = DEFAULT_MAP,
+        mask: np.ndarray = None,  # 칸마다 이동 가능한 방향의 비트(1 << 행동), 주어지면 directions 대신 사용
+        max_steps: int = None,  # 에피소드 최대 걸음 수(넘으면 truncated로 표시, None이면 제한 없음)
+        require_solvable: bool = False,  # 실패 지점을 피해 목표에 갈 수 없는 미로면 ValueError
+        shaping=None,  # 보상 shaping 잠재 함수: None, "manhattan", "distance" 또는 Φ (세로, 가로) 배열
+        shaping_gamma: float = 0.9,  # shaping에 쓰는 할인율(최적 정책이 바뀌지 않도록 에이전트의 gamma와 같게)
     ):
         self.action_space = [0, 1, 2, 3]  # 행동 공간
         self.action_meaning = {  # 행동의 의미
@@ -34,25 +42,154 @@ class MazeWorld:
             3: "RIGHT",
         }
 
+        for name, point in (("start", start), ("goal", goal), ("end", end)):
+            if point is None:  # 지점 없이 저장한 미로 파일(load_maze는 지정하지 않은 지점을 None으로 줌)
+                raise ValueError(f"the maze has no {name} point")
+
         self.goal_state = goal  # 목표 상태
         self.end_state = end  # 도달 시 과제 실패
         self.start_state = start  # 시작 상태
         self.agent_state = self.start_state  # 에이전트 초기 상태
 
-        # 미로의 두께가 없는 벽을 표현하기 위하여 각 상태에서 이동할 수 있는 방향을 명시
-        self.possible_direction = np.array(directions, dtype=object)
-    
+        self.max_steps = max_steps
+        self.shaping = shaping
+        self.shaping_gamma = shaping_gamma
+        self.elapsed_steps = 0  # 이번 에피소드에서 진행한 걸음 수
+        self.truncated = False  # 마지막 step이 목표/실패 지점 도달 없이 max_steps에 걸려 끝났는지
+
+        # 미로의 두께가 없는 벽을 표현하기 위하여 각 상태에서 이동할 수 있는 방향을 비트로 명시
+        # (칸마다 4비트, (세로, 가로) uint8 배열)
+        self.mask = to_mask(directions) if mask is None else mask
+
+        # 미로를 정수 상태 번호(row * width + col) 기반의 표로 한 번만 컴파일
+        self.compile()
+
+        if require_solvable and not self.solvable:
+            raise ValueError(f"goal {self.goal_state} is unreachable from {self.start_state}")
+
+    def compile(self):  # 상태 전이, 보상, 종료 여부 표 생성
+        height, width = self.mask.shape
+        state_size, action_size = height * width, len(self.action_space)
+
+        rows, cols = np.divmod(np.arange(state_size), width)
+        movable = to_movable(self.mask).reshape(state_size, action_size)
+
+        action_move_map = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+        next_rows = rows[:, None] + np.where(movable, action_move_map[:, 0], 0)
+        next_cols = cols[:, None] + np.where(movable, action_move_map[:, 1], 0)
+
+        goal_index = self.to_index(self.goal_state, width)
+        end_index = self.to_index(self.end_state, width)
+
+        self.next_state_table = next_rows * width + next_cols  # (S, A)
+        self.reward_table = np.full((state_size, action_size), -1.0)  # (S, A)
+        self.reward_table[self.next_state_table == goal_index] = 10
+        self.reward_table[self.next_state_table == end_index] = -10
+        self.terminal_table = np.zeros(state_size, dtype=bool)  # (S,)
+        self.terminal_table[[goal_index, end_index]] = True
+        self.done_table = self.terminal_table[self.next_state_table]  # (S, A)
+        self._width = width
+
+        # 잠재 함수 기반 보상 shaping: F(s, a) = shaping_gamma * Φ(s') - Φ(s), 종료 상태의 Φ는 0
+        # 종료까지 F의 할인된 합은 항상 -Φ(시작)이므로 최적 정책은 그대로이고, 목표 방향으로
+        # 움직일 때마다 보상이 생겨 큰 미로에서 목표 보상이 퍼지기 전에도 학습 신호가 있음
+        # reward_table(step, reward와 DP가 쓰는 보상)에 F를 더하고, 원래 보상은 base_reward_table에 보관
+        self.potential = None
+        self.base_reward_table = self.reward_table
+        self.shaping_table = np.zeros((state_size, action_size))  # (S, A)
+        if self.shaping is not None:
+            potential = self.compute_potential(self.shaping).ravel()
+            potential[self.terminal_table] = 0
+            self.potential = potential.reshape(height, width)
+            self.shaping_table = self.shaping_gamma * potential[self.next_state_table] - potential[:, None]
+            self.reward_table = self.base_reward_table + self.shaping_table
+
+        # 한 스텝씩 호출되는 step/next_state/reward는 numpy 스칼라 인덱싱보다 빠른 list 사용
+        self._state_list = [(int(r), int(c)) for r, c in zip(rows, cols)]
+        self._next_state_list = self.next_state_table.tolist()
+        if self.shaping is None:
+            self._reward_list = self.reward_table.astype(int).tolist()
+        else:
+            self._reward_list = self.reward_table.tolist()
+        self._done_list = self.done_table.tolist()
+        self._agent_index = self.to_index(self.agent_state)
+        self._exporter = None  # 미로가 바뀌면 벽 층을 다시 만들도록 초기화
+
+        # 시작 상태에서 갈 수 있는 상태(목표/실패 지점에 도착하면 과제가 끝나므로 그 너머로는 진행하지 않음)
+        self.reachable_table = self.find_reachable(self.to_index(self.start_state, width))  # (S,)
+
+    def find_reachable(self, start_index):  # start_index에서 종료 상태를 거치지 않고 갈 수 있는 상태(BFS)
+        reachable = [False] * len(self._state_list)
+        reachable[start_index] = True
+        terminal = self.terminal_table.tolist()
+        queue = deque([start_index])
+        while queue:
+            index = queue.popleft()
+            if terminal[index]:
+                continue
+            for next_index in self._next_state_list[index]:
+                if not reachable[next_index]:
+                    reachable[next_index] = True
+                    queue.append(next_index)
+        return np.array(reachable)
+
+    def compute_potential(self, shaping):  # shaping 인자로 잠재 함수 Φ 계산, (세로, 가로) float
+        # 거리 d인 칸의 Φ는 걸음마다 보상 -1을 d번 받을 때의 할인된 합 -(1 - γ^d) / (1 - γ)
+        # (Φ = -d를 그대로 쓰면 γ < 1일 때 먼 칸에서 제자리걸음의 보상 -1 + (1 - γ)d가 양수가 되어 맴돌게 됨.
+        #  이 Φ에서는 목표 쪽 이동의 보상이 0, 나머지 이동은 음수)
+        if isinstance(shaping, str):
+            if shaping == "manhattan":  # 벽을 무시한 목표까지의 거리
+                rows, cols = np.indices(self.mask.shape)
+                distance = np.abs(rows - self.goal_state[0]) + np.abs(cols - self.goal_state[1])
+            elif shaping == "distance":  # 실패 지점을 피한 미로 안의 최단 거리
+                distance = distance_to_goal(self)
+                distance[distance < 0] = distance.max() + 1  # 목표에 갈 수 없는 칸은 가장 먼 칸보다 한 칸 더
+            else:
+                raise ValueError(f"unknown shaping {shaping!r}")
+
+            gamma = self.shaping_gamma
+            if gamma == 1:
+                return -distance.astype(float)
+            return -(1 - gamma ** distance.astype(float)) / (1 - gamma)
+
+        potential = np.asarray(shaping, dtype=float)
+        if potential.shape != self.mask.shape:
+            raise ValueError(f"potential shape {potential.shape} does not match the maze {self.mask.shape}")
+        return potential.copy()
+
+    @property
+    def solvable(self):  # 실패 지점을 피해 시작에서 목표에 도달할 수 있는지
+        return bool(self.reachable_table[self.to_index(self.goal_state)])
+
+    @property
+    def terminable(self):  # 목표나 실패 지점 중 하나에라도 도달할 수 있는지(아니면 에피소드가 끝나지 않음)
+        return bool(self.reachable_table[self.terminal_table].any())
+
+    @property
+    def state_size(self):  # 상태 개수
+        return len(self._state_list)
+
+    def to_index(self, state, width=None):  # (row, col) 상태를 상태 번호로 변환
+        return state[0] * (self._width if width is None else width) + state[1]
+
+    def to_state(self, index):  # 상태 번호를 (row, col) 상태로 변환
+        return self._state_list[index]
+
+    @property
+    def possible_direction(self):  # 칸마다 이동 가능한 행동 목록(directions 형식)
+        return to_directions(self.mask)
+
     @property
     def height(self):  # 세로
-        return len(self.possible_direction)
+        return self.mask.shape[0]
 
     @property
     def width(self):  # 가로
-        return len(self.possible_direction[0])
+        return self.mask.shape[1]
 
     @property
     def shape(self):  # 세로, 가로
-        return self.reward_map.shape
+        return self.height, self.width
 
     def actions(self):  # 모든 행동 반환
         return self.action_space
@@ -63,52 +200,72 @@ class MazeWorld:
                 yield (h, w)
 
     def next_state(self, state, action):  # 현재 상태와 행동에 따른 다음 상태 반환
-        action_move_map = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        if action in self.possible_direction[state]:
-            move = action_move_map[action]
-            next_state = (state[0] + move[0], state[1] + move[1])
-        else:
-            next_state = state
-
-        return next_state
+        index = state[0] * self._width + state[1]
+        return self._state_list[self._next_state_list[index][action]]
 
     def reward(
         self, state, action, next_state
     ):  # 현재 상태, 행동, 다음 상태에 따른 보상 반환
-        if next_state == self.goal_state:
-            reward = 10
-        elif next_state == self.end_state:
-            reward = -10
-        else:
-            reward = -1
-
-        return reward
+        # 결정론적 환경이므로 보상은 (상태, 행동)만으로 결정됨
+        return self._reward_list[state[0] * self._width + state[1]][action]
 
     def reset(self):  # 과제 종료시 에이전트 위치 초기화
         self.agent_state = self.start_state
+        self._agent_index = self.to_index(self.start_state)
+        self.elapsed_steps = 0
+        self.truncated = False
         return self.agent_state
 
     def step(self, action):  # 행동 후 다음 상태, 보상과 과제 종료 여부 반환
-        state = self.agent_state
-        next_state = self.next_state(state, action)
-        reward = self.reward(state, action, next_state)
-        done = next_state == self.goal_state or next_state == self.end_state
+        # done은 목표/실패 지점에 도달한 경우만 True. max_steps에 걸려 끝나면 done은 False,
+        # truncated가 True이므로 에이전트는 다음 상태의 가치로 부트스트랩해야 함
+        index = self._agent_index
+        next_index = self._next_state_list[index][action]
+        reward = self._reward_list[index][action]
+        done = self._done_list[index][action]
+
+        elapsed_steps = self.elapsed_steps + 1
+        self.elapsed_steps = elapsed_steps
+        self.truncated = elapsed_steps == self.max_steps and not done
+        self._agent_index = next_index
+        self.agent_state = self._state_list[next_index]
+        return self.agent_state, reward, done
 
-        self.agent_state = next_state
-        return next_state, reward, done
+    def save(self, path):  # 미로를 비트 배열 파일로 저장(maze_format 참고)
+        save_maze(path, self.mask, self.start_state, self.goal_state, self.end_state)
+
+    @classmethod
+    def load(cls, path, mmap=True):  # 저장한 미로 불러오기(mmap이면 칸 배열을 np.memmap으로 연결)
+        return cls(**load_maze(path, mmap))
 
     def render_v(self, v=None, policy=None, print_value=True):  # V 값 시각화
         renderer = render_helper.Renderer(
-            self.possible_direction, self.goal_state, self.end_state, self.start_state
+            self.mask, self.goal_state, self.end_state, self.start_state
         )
         renderer.render_v(v, policy, print_value)
 
     def render_q(self, q=None, print_value=True):  # Q 값 시각화
         renderer = render_helper.Renderer(
-            self.possible_direction, self.goal_state, self.end_state, self.start_state
+            self.mask, self.goal_state, self.end_state, self.start_state
         )
         renderer.render_q(q, print_value)
 
+    def exporter(self):  # 이미지 저장용 Renderer(벽 층을 재사용하도록 미로마다 하나만 만듦)
+        if self._exporter is None:
+            self._exporter = self.live_renderer()
+        return self._exporter
+
+    def export_v(self, path, v, figsize=None, dpi=100):  # V 값을 창 없이 이미지 파일(PNG, SVG 등)로 저장
+        self.exporter().export(path, v, "v", figsize, dpi)
+
+    def export_q(self, path, q, figsize=None, dpi=100):  # Q 값을 창 없이 이미지 파일(PNG, SVG 등)로 저장
+        self.exporter().export(path, q, "q", figsize, dpi)
+
+    def live_renderer(self):  # 학습 중 실시간 시각화용 Renderer(update_live, live_callback 사용)
+        return render_helper.Renderer(
+            self.mask, self.goal_state, self.end_state, self.start_state
+        )
+
 
 if __name__ == "__main__":
     env = MazeWorld()
@@ -1,196 +1,396 @@
+import os
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+from common.q_table import QTable
+from common.maze_format import to_movable
+
+# 칸마다 글자를 그리는 것은 칸 수가 이 값 이하일 때만(그 이상은 색만 표시)
+TEXT_CELL_LIMIT = 400
+# 격자 눈금선은 칸 수가 이 값 이하일 때만
+GRID_CELL_LIMIT = 10000
+# Q 삼각형과 정책 화살표를 도형으로 그리는 것은 칸 수가 이 값 이하일 때만
+# (그 이상은 Q를 칸마다 4x4 픽셀 이미지 한 장으로 그리고 화살표는 생략)
+POLYGON_CELL_LIMIT = 40000
+
+# 행동별 Q 삼각형의 꼭짓점(칸 왼쪽 아래 기준)과 글자 위치
+ACTION_TRIANGLES = np.array([
+    ((0.5, 0.5), (1, 1), (0, 1)),  # UP
+    ((0, 0), (1, 0), (0.5, 0.5)),  # DOWN
+    ((0, 0), (0.5, 0.5), (0, 1)),  # LEFT
+    ((0.5, 0.5), (1, 0), (1, 1)),  # RIGHT
+])
+ACTION_TEXT_OFFSETS = np.array([(0.1, 0.8), (0.1, 0.1), (-0.2, 0.4), (0.4, 0.4)])
+# 4x4 픽셀 칸에서 각 픽셀이 속한 행동 삼각형(위쪽 행부터, 행동마다 4픽셀씩 바람개비 모양)
+ACTION_PIXELS = np.array([
+    [0, 0, 0, 3],
+    [2, 0, 3, 3],
+    [2, 2, 1, 3],
+    [2, 1, 1, 1],
+])
+# 정책 화살표의 방향(x, y)
+ACTION_ARROWS = np.array([(0, 1), (0, -1), (-1, 0), (1, 0)])
+
 
 class Renderer:
-    def __init__(self, possible_direction, goal_state, end_state, start_state):
-        self.possible_direction = possible_direction
+    def __init__(self, mask, goal_state, end_state, start_state):
+        self.mask = mask  # 칸마다 이동 가능한 방향의 비트(1 << 행동), (H, W)
         self.goal_state = goal_state
         self.end_state = end_state
         self.start_state = start_state
-        self.ys = len(self.possible_direction)
-        self.xs = len(self.possible_direction[0])
+        self.ys, self.xs = self.mask.shape
+
+        # 칸마다 이동 가능한 방향, (H, W, 4)
+        self.movable = to_movable(self.mask)
 
-        # 입구와 출구 표시
-        #self.possible_direction[self.start_state].append(0)
-        #self.possible_direction[self.goal_state].append(1)
-        
         self.ax = None
         self.fig = None
-        self.first_flg = True
+        self.first_flg = True  # 실시간 표시의 정적인 층을 아직 그리지 않았는지 여부
+
+        # 실시간 표시용: 값 층, 그 위의 벽과 글자, 정적인 층을 저장한 배경 이미지
+        self.live_kind = None
+        self.live_layer = None
+        self.live_overlays = []
+        self.background = None
+
+        # 이미지 저장용(창 없이 Agg로 그림): 벽 경로와 벽·격자·글자 층 이미지는 미로마다 한 번만 만듦
+        self.wall_path = None
+        self.export_layers = {}  # (종류, 그림 크기, dpi) -> (값 층 Figure, 값 층, 벽 층 RGBA)
+
+        color_list = ['red', 'white', 'green']
+        self.cmap = matplotlib.colors.LinearSegmentedColormap.from_list(
+            'colormap_name', color_list)
+
+    @property
+    def show_text(self):  # 칸마다 글자를 그릴지 여부
+        return self.ys * self.xs <= TEXT_CELL_LIMIT
 
     # 그래프 기본 설정
     def set_figure(self, figsize=None):
-        fig = plt.figure(figsize=figsize)
-        self.ax = fig.add_subplot(111)
-        ax = self.ax
+        self.fig = plt.figure(figsize=figsize)
+        self.ax = self.fig.add_subplot(111)
+        self.set_axes(self.ax)
+
+    def set_axes(self, ax):
         ax.clear()
         ax.tick_params(labelbottom=False, labelleft=False, labelright=False, labeltop=False)
-        ax.set_xticks(range(self.xs+1))
-        ax.set_yticks(range(self.ys+1))
+        if self.ys * self.xs <= GRID_CELL_LIMIT:
+            ax.set_xticks(range(self.xs+1))
+            ax.set_yticks(range(self.ys+1))
+            ax.grid(True)
+        else:
+            ax.set_xticks([])
+            ax.set_yticks([])
         ax.set_xlim(0, self.xs)
-        ax.set_xlim(0, self.ys)
-        ax.grid(True)
-    
-    # 미로 표시
+        ax.set_ylim(0, self.ys)
+
+    # 벽 선분 목록, (N, 2, 2)
+    def wall_segments(self):
+        ys, xs = self.ys, self.xs
+        blocked = ~self.movable
+
+        # 칸 경계마다 양쪽 중 한 칸이라도 막혀 있으면 벽
+        horizontal = np.zeros((ys + 1, xs), dtype=bool)  # 각 행 위쪽 경계(마지막은 맨 아래)
+        horizontal[:-1] |= blocked[:, :, 0]
+        horizontal[1:] |= blocked[:, :, 1]
+        vertical = np.zeros((ys, xs + 1), dtype=bool)  # 각 열 왼쪽 경계(마지막은 맨 오른쪽)
+        vertical[:, :-1] |= blocked[:, :, 2]
+        vertical[:, 1:] |= blocked[:, :, 3]
+
+        rows, cols = np.nonzero(horizontal)
+        h_segments = np.stack(
+            (np.stack((cols, ys - rows), axis=1), np.stack((cols + 1, ys - rows), axis=1)), axis=1)
+        rows, cols = np.nonzero(vertical)
+        v_segments = np.stack(
+            (np.stack((cols, ys - rows - 1), axis=1), np.stack((cols, ys - rows), axis=1)), axis=1)
+
+        return np.concatenate((h_segments, v_segments)).astype(float)
+
+    # 미로 표시(모든 벽 선분을 하나의 경로로 묶어 그림)
     def present_maze(self, ax):
+        if self.wall_path is None:
+            segments = self.wall_segments()
+            codes = np.tile([Path.MOVETO, Path.LINETO], len(segments)).astype(Path.code_type)
+            self.wall_path = Path(segments.reshape(-1, 2), codes)
+        walls = PathPatch(self.wall_path, fill=False, edgecolor='b', lw=2)
+        ax.add_artist(walls)  # add_patch는 선분마다 축 범위를 갱신하므로 사용하지 않음(범위는 set_figure에서 고정)
+        return walls
+
+    # 목표, 실패 지점 표시
+    def present_terminals(self, ax, offset):
+        ys = self.ys
+        texts = []
+        for state, txt in ((self.goal_state, 'R +10 (GOAL)'), (self.end_state, 'R -10 (END)')):
+            y, x = state
+            texts.append(ax.text(x+offset[0], ys-y-1+offset[1], txt))
+        return texts
+
+    # 정책의 최대 행동들을 하나의 화살표 묶음(quiver)으로 표시
+    def present_policy(self, ax, policy):
         ys, xs = self.ys, self.xs
-        direction_space = [0, 1, 2, 3]
-        for y in range(ys):
-            for x in range(xs):
-                state = (y, x)
-                
-                tx, ty = x, ys-y-1
-                direction_map = {
-                        0: ((tx+1, ty+1), (tx, ty+1)),
-                        1: ((tx, ty), (tx+1, ty)),
-                        2: ((tx, ty), (tx, ty+1)),
-                        3: ((tx+1, ty), (tx+1, ty+1)),
-                    }
-                
-                for direction in direction_space:
-                    if direction not in self.possible_direction[state]:
-                        wall = plt.Polygon(direction_map[direction], edgecolor='b', lw=2)
-                        ax.add_patch(wall)
+        if isinstance(policy, np.ndarray):  # 상태별 행동 배열
+            max_actions = np.eye(4, dtype=bool)[policy.reshape(ys, xs)]
+        else:
+            max_actions = np.zeros((ys, xs, 4), dtype=bool)
+            for (y, x), actions in policy.items():
+                max_value = max(actions.values())
+                for action, value in actions.items():
+                    max_actions[y, x, action] = value == max_value
+
+        for state in (self.goal_state, self.end_state):
+            max_actions[state] = False
+
+        rows, cols, actions = np.nonzero(max_actions)
+        arrows = ACTION_ARROWS[actions]
+        return ax.quiver(
+            cols + 0.5 + arrows[:, 0] * 0.1, ys - rows - 0.5 + arrows[:, 1] * 0.1,
+            arrows[:, 0], arrows[:, 1],
+            angles='xy', scale_units='xy', scale=5, pivot='middle', width=0.004 * min(1, 20 / max(ys, xs)))
+
+    # dict, (H, W) 또는 (S,) 배열로 주어진 V를 (H, W) 배열로 변환
+    def to_v_array(self, v):
+        if isinstance(v, np.ndarray):
+            return v.reshape(self.ys, self.xs)
+
+        v_array = np.zeros((self.ys, self.xs))
+        for state, value in v.items():
+            v_array[state] = value
+        return v_array
+
+    # dict, QTable, (H, W, 4) 또는 (S, 4) 배열로 주어진 Q를 (H, W, 4) 배열로 변환
+    def to_q_array(self, q):
+        if isinstance(q, QTable):
+            return q.table
+        if isinstance(q, np.ndarray):
+            return q.reshape(self.ys, self.xs, -1)
+
+        q_array = np.zeros((self.ys, self.xs, 4))
+        for (state, action), value in q.items():
+            q_array[state][action] = value
+        return q_array
+
+    # 색 범위를 0을 중심으로 대칭, 최소 [-1, 1]로 설정
+    @staticmethod
+    def color_limit(values):
+        vmax = max(values.max(), abs(values.min()))
+        return 1 if vmax < 1 else vmax
 
     # 가치 함수 표현
     def render_v(self, v=None, policy=None, print_value=True):
         self.set_figure()
-        
+
         ys, xs = self.ys, self.xs
         ax = self.ax
 
         if v is not None:
-            color_list = ['red', 'white', 'green']
-            cmap = matplotlib.colors.LinearSegmentedColormap.from_list(
-                'colormap_name', color_list)
-            
-            v_dict = v
-            v = np.zeros(self.possible_direction.shape)
-            for state, value in v_dict.items():
-                v[state] = value
-            
-            vmax, vmin = v.max(), v.min()
-            vmax = max(vmax, abs(vmin))
-            vmin = -1 * vmax
-            vmax = 1 if vmax < 1 else vmax
-            vmin = -1 if vmin > -1 else vmin
-
-            ax.pcolormesh(np.flipud(v), cmap=cmap, vmin=vmin, vmax=vmax)
-
-        for y in range(ys):
-            for x in range(xs):
-                state = (y, x)
-
-                txt = ''
-                if state == self.goal_state:
-                    txt = 'R +10' + ' (GOAL)'
-                elif state == self.end_state:
-                    txt = 'R -10' + ' (END)'
-                
-                if txt:
-                    ax.text(x+0.1, ys-y-0.9, txt)
-
-                if v is not None:
-                    if print_value:
-                        offsets = [(0.4, -0.15), (-0.15, -0.3)]
-                        key = 0
-                        if v.shape[0] > 7: key = 1
-                        offset = offsets[key]
+            v = self.to_v_array(v)
+            vmax = self.color_limit(v)
+            ax.pcolormesh(np.flipud(v), cmap=self.cmap, vmin=-vmax, vmax=vmax)
+
+            if print_value and self.show_text:
+                offset = (-0.15, -0.3) if v.shape[0] > 7 else (0.4, -0.15)
+                for y in range(ys):
+                    for x in range(xs):
                         ax.text(x+offset[0], ys-y+offset[1], "{:12.2f}".format(v[y, x]))
 
-                # policy 출력
-                if policy is not None:
-                    actions = policy[state]
-                    max_actions = [kv[0] for kv in actions.items() if kv[1] == max(actions.values())]
-
-                    arrows = ["↑", "↓", "←", "→"]
-                    offsets = [(0, 0.1), (0, -0.1), (-0.1, 0), (0.1, 0)]
-                    for action in max_actions:
-                        arrow = arrows[action]
-                        offset = offsets[action]
-                        if state == self.goal_state or state == self.end_state:
-                            continue
-                        ax.text(x+0.45+offset[0], ys-y-0.5+offset[1], arrow)
-        
+        self.present_terminals(ax, (0.1, 0.1))
+
+        # policy 출력
+        if policy is not None and ys * xs <= POLYGON_CELL_LIMIT:
+            self.present_policy(ax, policy)
+
         self.present_maze(self.ax)
         plt.show()
 
+    # Q 삼각형 꼭짓점과 대상 칸, (N, 3, 2)
+    def q_triangles(self):
+        ys, xs = self.ys, self.xs
+        cells = np.ones((ys, xs), dtype=bool)
+        for state in (self.goal_state, self.end_state):
+            cells[state] = False
+        rows, cols = np.nonzero(cells)
+
+        corners = np.stack((cols, ys - rows - 1), axis=1).astype(float)  # 칸 왼쪽 아래
+        triangles = corners[:, None, None, :] + ACTION_TRIANGLES[None]  # (칸, 행동, 3, 2)
+        return triangles.reshape(-1, 3, 2), rows, cols
+
+    # Q 값을 삼각형 색으로 변환
+    def q_colors(self, q, rows, cols, qmax):
+        return self.cmap(0.5 + (q[rows, cols].ravel() / qmax) / 2)
+
+    # 큰 미로용: 칸마다 4x4 픽셀로 Q 삼각형을 나타낸 RGBA 이미지, (H * 4, W * 4, 4)
+    def q_raster(self, q, qmax):
+        ys, xs = self.ys, self.xs
+        colors = self.cmap(0.5 + (q / qmax) / 2, bytes=True)  # (H, W, 4, RGBA)
+        for state in (self.goal_state, self.end_state):
+            colors[state] = 255
+
+        pixels = colors[:, :, ACTION_PIXELS]  # (H, W, 4, 4, RGBA)
+        return pixels.transpose(0, 2, 1, 3, 4).reshape(ys * 4, xs * 4, 4)
+
     # 행동 가치 함수 표현
     def render_q(self, q, show_greedy_policy=True):
         self.set_figure()
 
         ys, xs = self.ys, self.xs
         ax = self.ax
-        action_space = [0, 1, 2, 3]
 
-        qmax, qmin = max(q.values()), min(q.values())
-        qmax = max(qmax, abs(qmin))
-        qmin = -1 * qmax
-        qmax = 1 if qmax < 1 else qmax
-        qmin = -1 if qmin > -1 else qmin
+        q = self.to_q_array(q)
+        qmax = self.color_limit(q)
 
-        color_list = ['red', 'white', 'green']
-        cmap = matplotlib.colors.LinearSegmentedColormap.from_list(
-            'colormap_name', color_list)
-        
-        for y in range(ys):
-            for x in range(xs):
-                for action in action_space:
-                    state = (y, x)
-                    
-                    txt = ''
-                    if state == self.goal_state:
-                        txt = 'R +10' + ' (GOAL)'
-                    elif state == self.end_state:
-                        txt = 'R -10' + ' (END)'
-
-                    if txt:
-                        ax.text(x+0.05, ys-y-0.95, txt)
-
-                    if state == self.goal_state or state == self.end_state:
-                        continue
-
-                    tx, ty = x, ys-y-1
-
-                    action_map = {
-                        0: ((0.5+tx, 0.5+ty), (tx+1, ty+1), (tx, ty+1)),
-                        1: ((tx, ty), (tx+1, ty), (tx+0.5, ty+0.5)),
-                        2: ((tx, ty), (tx+0.5, ty+0.5), (tx, ty+1)),
-                        3: ((0.5+tx, 0.5+ty), (tx+1, ty), (tx+1, ty+1)),
-                    }
-                    offset_map = {
-                        0: (0.1, 0.8),
-                        1: (0.1, 0.1),
-                        2: (-0.2, 0.4),
-                        3: (0.4, 0.4),
-                    }
-
-                    if state == self.goal_state or state == self.end_state:
-                        ax.add_patch(plt.Rectangle((tx, ty), 1, 1, fc=(0., 1., 0., 1.)))
-                    else:
-                        tq = q[(state, action)]
-                        color_scale = 0.5 + (tq / qmax) / 2
-
-                        poly = plt.Polygon(action_map[action], fc=cmap(color_scale))
-                        ax.add_patch(poly)
-
-                        offset = offset_map[action]
-                        ax.text(tx+offset[0], ty+offset[1], "{:12.2f}".format(tq))
+        triangles, rows, cols = self.q_triangles()
+        if ys * xs <= POLYGON_CELL_LIMIT:
+            ax.add_collection(
+                PolyCollection(triangles, facecolors=self.q_colors(q, rows, cols, qmax)), autolim=False)
+        else:
+            ax.imshow(self.q_raster(q, qmax), extent=(0, xs, 0, ys), interpolation='nearest')
 
+        if self.show_text:
+            for row, col in zip(rows, cols):
+                tx, ty = col, ys-row-1
+                for action, offset in enumerate(ACTION_TEXT_OFFSETS):
+                    ax.text(tx+offset[0], ty+offset[1], "{:12.2f}".format(q[row, col, action]))
+
+        self.present_terminals(ax, (0.05, 0.05))
         self.present_maze(self.ax)
         plt.show()
 
         # 정책을 그리디하게 표현(render_v의 policy 출력 함수 이용)
         if show_greedy_policy:
-            policy = {}
-            for y in range(self.ys):
-                for x in range(self.xs):
-                    state = (y, x)
-                    qs = [q[state, action] for action in action_space]
-                    max_action = np.argmax(qs)
-                    probs = {0:0.0, 1:0.0, 2:0.0, 3:0.0}
-                    probs[max_action] = 1
-                    policy[state] = probs
-
-            self.render_v(None, policy)
\ No newline at end of file
+            self.render_v(None, q.argmax(axis=2))
+
+    # 색만 바꿔 가며 다시 쓰는 값 층(Q: 삼각형 묶음 또는 큰 미로에서는 픽셀 이미지, V: 칸 색)
+    def add_value_layer(self, ax, kind, animated=False):
+        ys, xs = self.ys, self.xs
+        if kind == "q" and ys * xs <= POLYGON_CELL_LIMIT:
+            triangles, self.layer_rows, self.layer_cols = self.q_triangles()
+            layer = PolyCollection(triangles, animated=animated)
+            ax.add_collection(layer, autolim=False)
+            return layer
+        if kind == "q":
+            return ax.imshow(
+                np.zeros((ys * 4, xs * 4, 4), dtype=np.uint8),
+                extent=(0, xs, 0, ys), interpolation='nearest', animated=animated)
+        return ax.pcolormesh(np.zeros((ys, xs)), cmap=self.cmap, animated=animated)
+
+    def set_value_layer(self, layer, values, kind):
+        if kind == "q":
+            q = self.to_q_array(values)
+            qmax = self.color_limit(q)
+            if isinstance(layer, PolyCollection):
+                layer.set_facecolor(self.q_colors(q, self.layer_rows, self.layer_cols, qmax))
+            else:
+                layer.set_data(self.q_raster(q, qmax))
+        else:
+            v = self.to_v_array(values)
+            vmax = self.color_limit(v)
+            layer.set_array(np.flipud(v).ravel())
+            layer.set_clim(-vmax, vmax)
+
+    # 실시간 표시 준비: 축과 격자 같은 정적인 층은 한 번만 그려 배경으로 저장하고,
+    # 매번 바뀌는 값 층과 그 위에 놓이는 벽, 목표/실패 글자만 animated로 두어 블리팅으로 다시 그림
+    def start_live(self, kind="q"):
+        if not self.first_flg:
+            return
+
+        self.set_figure()
+        ax = self.ax
+
+        self.live_layer = self.add_value_layer(ax, kind, animated=True)
+        self.live_kind = kind
+
+        self.live_overlays = [self.present_maze(ax), *self.present_terminals(ax, (0.05, 0.05))]
+        for artist in self.live_overlays:
+            artist.set_animated(True)
+
+        # 창 크기 변경 등으로 전체를 다시 그리면 배경을 다시 저장
+        self.fig.canvas.mpl_connect('draw_event', self.on_live_draw)
+        plt.show(block=False)
+        self.fig.canvas.draw()
+        self.first_flg = False
+
+    def on_live_draw(self, event):
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_live_artists()
+
+    def draw_live_artists(self):
+        self.ax.draw_artist(self.live_layer)
+        for artist in self.live_overlays:
+            self.ax.draw_artist(artist)
+
+    # 실시간 표시 갱신: 값 층의 색 배열만 바꾸고 배경 위에 값 층과 벽만 다시 그림
+    def update_live(self, values, kind="q"):
+        self.start_live(kind)
+        self.set_value_layer(self.live_layer, values, self.live_kind)
+
+        canvas = self.fig.canvas
+        if self.background is None:  # 아직 배경이 저장되지 않음(첫 draw_event 전)
+            canvas.draw()
+        else:
+            canvas.restore_region(self.background)
+            self.draw_live_artists()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    # train의 callback으로 넘기면 every 에피소드마다 get_values()의 값으로 실시간 표시 갱신
+    def live_callback(self, get_values, every=10, kind="q"):
+        def callback(episode, steps, total_reward):
+            if (episode + 1) % every == 0:
+                self.update_live(get_values(), kind)
+
+        return callback
+
+    # 창 없이 그릴 Figure(pyplot에 등록하지 않으므로 plt.show나 창 관리와 무관)
+    def new_figure(self, figsize=None, dpi=100):
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        self.set_axes(ax)
+        return fig, ax
+
+    # 저장용 층 준비: 값 층만 있는 Figure와, 벽·격자·목표/실패 글자만 투명 배경에 그린 RGBA 이미지
+    # (같은 미로의 스냅숏을 여러 장 저장할 때는 값 층만 다시 그리고 벽 층은 그대로 합성)
+    def export_layer(self, kind, figsize, dpi):
+        key = (kind, figsize, dpi)
+        if key not in self.export_layers:
+            value_fig, ax = self.new_figure(figsize, dpi)
+            ax.set_axis_off()
+            layer = self.add_value_layer(ax, kind)
+
+            overlay_fig, ax = self.new_figure(figsize, dpi)
+            overlay_fig.patch.set_alpha(0)
+            ax.patch.set_alpha(0)
+            self.present_terminals(ax, (0.05, 0.05))
+            self.present_maze(ax)
+            overlay_fig.canvas.draw()
+            overlay = np.asarray(overlay_fig.canvas.buffer_rgba(), dtype=np.float64) / 255
+
+            self.export_layers[key] = (value_fig, layer, overlay)
+        return self.export_layers[key]
+
+    # 값을 색으로 그린 RGB 이미지, (세로 픽셀, 가로 픽셀, 3) uint8
+    def export_raster(self, values, kind="q", figsize=None, dpi=100):
+        value_fig, layer, overlay = self.export_layer(kind, figsize, dpi)
+        self.set_value_layer(layer, values, kind)
+        value_fig.canvas.draw()
+
+        image = np.asarray(value_fig.canvas.buffer_rgba())[:, :, :3] / 255
+        alpha = overlay[:, :, 3:]
+        return np.round((image * (1 - alpha) + overlay[:, :, :3] * alpha) * 255).astype(np.uint8)
+
+    # 값을 색으로 그려 파일로 저장(확장자로 형식 결정). SVG 같은 벡터 형식은 매번 전체를 그리되
+    # 벽 경로는 미리 만든 것을 다시 씀
+    def export(self, path, values, kind="q", figsize=None, dpi=100):
+        if os.path.splitext(str(path))[1].lower() in ('.svg', '.pdf', '.eps', '.ps'):
+            fig, ax = self.new_figure(figsize, dpi)
+            self.set_value_layer(self.add_value_layer(ax, kind), values, kind)
+            self.present_terminals(ax, (0.05, 0.05))
+            self.present_maze(ax)
+            fig.savefig(path)
+        else:
+            plt.imsave(path, self.export_raster(values, kind, figsize, dpi))
@@ -0,0 +1,87 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from common.mazeworld import MazeWorld
+from common.trainer import train
+
+# 서로 독립적인 학습(시드, 하이퍼파라미터, 미로가 다른)을 여러 프로세스에 나눠 실행.
+# 각 실행은 {"maze": MazeWorld 인자 dict, "agent": Q 테이블을 가진 에이전트 클래스,
+#           "params": 에이전트 속성 덮어쓰기 dict(선택), "seed": 난수 시드(선택)} 로 지정하고,
+# 학습된 Q는 dict를 pickle로 돌려받는 대신 공유 메모리의 각 실행 구간에 직접 기록함
+
+
+def _q_shape(run):  # 실행의 Q 배열 모양 (H, W, A)
+    mask, directions = run["maze"].get("mask"), run["maze"].get("directions")
+    if mask is not None:
+        return (*mask.shape, 4)
+    if directions is None:  # MazeWorld 기본 미로
+        return (*MazeWorld().shape, 4)
+    return (len(directions), len(directions[0]), 4)
+
+
+def _train_worker(shm_name, offset, run, episodes, max_steps):
+    np.random.seed(run.get("seed"))
+    env = MazeWorld(**run["maze"])
+    agent = run["agent"](env.shape)
+    for name, value in run.get("params", {}).items():
+        setattr(agent, name, value)
+
+    history = train(env, agent, episodes, max_steps)
+
+    shm = SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(agent.Q.table.shape, dtype=np.float64, buffer=shm.buf, offset=offset)
+        out[...] = agent.Q.table
+        del out  # 공유 메모리를 닫기 전에 버퍼 참조 해제
+    finally:
+        shm.close()
+
+    return history
+
+
+def train_parallel(runs, episodes, max_steps=None, max_workers=None):
+    # 반환값: 실행 순서대로 (Q 배열 (H, W, A), 에피소드별 (걸음 수, 보상 합) 기록)
+    shapes = [_q_shape(run) for run in runs]
+    sizes = [int(np.prod(shape)) * np.dtype(np.float64).itemsize for shape in shapes]
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1])).tolist()
+
+    shm = SharedMemory(create=True, size=max(sum(sizes), 1))
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_train_worker, shm.name, offset, run, episodes, max_steps)
+                for run, offset in zip(runs, offsets)
+            ]
+            histories = [future.result() for future in futures]
+
+        results = []
+        for shape, offset, history in zip(shapes, offsets, histories):
+            view = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, offset=offset)
+            results.append((view.copy(), history))
+            del view
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
+
+
+if __name__ == "__main__":
+    import time
+    from common.maze_generator import generate_maze
+    from q_learning.q_learning import QLearningAgent
+
+    maze = generate_maze(12, 12, braid_factor=0.2, seed=0)
+    runs = [{"maze": maze, "agent": QLearningAgent, "seed": seed} for seed in range(32)]
+
+    start_time = time.time()
+    results = train_parallel(runs, episodes=300)
+    print(f"{len(runs)} runs in {time.time() - start_time:.2f}s")
+
+    mean_q = np.mean([q for q, _ in results], axis=0)
+    MazeWorld(**maze).render_q(mean_q)
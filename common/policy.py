@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class GreedyPolicy:
+    def __init__(
+        self,
+        shape: tuple[int, int],  # 미로의 세로, 가로
+        action_size: int = 4,  # 행동 개수
+        seed: int = None,  # 난수 시드(없으면 전역 np.random에서 뽑아 np.random.seed로 재현 가능)
+        block_size: int = 4096,  # 한 번에 미리 뽑아 둘 난수 개수
+    ):
+        self.width = shape[1]
+        self.action_size = action_size
+        self.block_size = block_size
+
+        # 상태 번호별 그리디 행동(-1이면 아직 정해지지 않아 모든 행동이 같은 확률)
+        self.greedy = np.full(shape[0] * shape[1], -1, dtype=np.int64)
+
+        if seed is None:
+            seed = np.random.randint(2**31)
+        self.rng = np.random.default_rng(seed)
+        self.refill()
+
+    # 행동 선택마다 난수 생성기를 호출하지 않도록 [0, 1) 난수와 무작위 행동을 묶음으로 미리 뽑아 둠
+    def refill(self):
+        self.uniforms = self.rng.random(self.block_size).tolist()
+        self.random_actions = self.rng.integers(self.action_size, size=self.block_size).tolist()
+        self.cursor = 0
+
+    def index(self, state):  # (row, col) 상태 또는 상태 번호를 상태 번호로
+        if type(state) is tuple:
+            return state[0] * self.width + state[1]
+        return state
+
+    def sample(self, state, epsilon=0.0):  # 확률 epsilon으로 무작위, 나머지는 그리디 행동
+        if self.cursor == self.block_size:
+            self.refill()
+        i = self.cursor
+        self.cursor = i + 1
+
+        greedy = self.greedy[self.index(state)]
+        if greedy < 0 or self.uniforms[i] < epsilon:
+            return self.random_actions[i]
+        return int(greedy)
+
+    def prob(self, state, action, epsilon=0.0):  # epsilon-그리디 정책에서 행동의 확률(off-policy 비율 계산용)
+        greedy = self.greedy[self.index(state)]
+        if greedy < 0:
+            return 1 / self.action_size
+        return epsilon / self.action_size + (1 - epsilon) * (action == greedy)
+
+    def update(self, state, action):  # 상태의 그리디 행동 변경
+        self.greedy[self.index(state)] = action
+
+    def probs(self, state, epsilon=0.0):  # 행동별 확률 dict(시각화 등 기존 dict 정책 형식이 필요할 때)
+        return {action: self.prob(state, action, epsilon) for action in range(self.action_size)}
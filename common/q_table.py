@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class QTable:
+    def __init__(
+        self,
+        shape: tuple[int, int],  # 미로의 세로, 가로
+        action_size: int = 4,  # 행동 개수
+        table: np.ndarray = None,  # 이미 있는 Q 값 배열(없으면 0으로 초기화)
+    ):
+        self.shape = tuple(shape)
+        self.action_size = action_size
+
+        if table is None:
+            table = np.zeros((*self.shape, action_size))
+        self.table = np.asarray(table, dtype=float).reshape(*self.shape, action_size)
+
+    @property
+    def flat(self):  # 상태 번호 기반의 (S, A) 뷰(복사 없음)
+        return self.table.reshape(-1, self.action_size)
+
+    def qs(self, state):  # 한 상태의 모든 행동 가치(뷰)
+        if type(state) is tuple:
+            return self.table[state[0], state[1]]
+        return self.flat[state]
+
+    def max(self, state):  # 한 상태의 최대 행동 가치
+        return self.qs(state).max()
+
+    def argmax(self, state):  # 한 상태의 그리디 행동
+        return int(self.qs(state).argmax())
+
+    def greedy_actions(self):  # 모든 상태의 그리디 행동, (H, W)
+        return self.table.argmax(axis=-1)
+
+    def copy(self):
+        return QTable(self.shape, self.action_size, self.table.copy())
+
+    # 기존 dict 기반 Q와 같이 Q[(row, col), action] 또는 Q[상태 번호, action]으로 접근
+    def __getitem__(self, key):
+        state, action = key
+        if type(state) is tuple:
+            return self.table[state[0], state[1], action]
+        return self.flat[state, action]
+
+    def __setitem__(self, key, value):
+        state, action = key
+        if type(state) is tuple:
+            self.table[state[0], state[1], action] = value
+        else:
+            self.flat[state, action] = value
@@ -0,0 +1,66 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+
+class ReplayBuffer:
+    FIELDS = ("states", "actions", "rewards", "next_states", "dones")  # 전이를 저장하는 배열 이름(체크포인트용)
+
+    def __init__(
+        self,
+        capacity: int,  # 저장할 최대 전이 개수(가득 차면 가장 오래된 것부터 덮어씀)
+        seed: int = None,  # 미니배치 추출용 난수 시드(없으면 전역 np.random에서 뽑아 np.random.seed로 재현 가능)
+    ):
+        self.capacity = capacity
+        if seed is None:
+            seed = np.random.randint(2**31)
+        self.rng = np.random.default_rng(seed)
+
+        # 전이를 미리 할당한 배열에 원형으로 저장(상태는 상태 번호)
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+
+        self.index = 0  # 다음에 쓸 위치
+        self.size = 0  # 저장된 전이 개수
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        index = self.index
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_states[index] = next_state
+        self.dones[index] = done
+
+        self.index = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):  # 여러 전이를 한 번에 저장(VectorMazeWorld 등)
+        count = len(states)
+        indices = (self.index + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+
+        self.index = (self.index + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size):  # 무작위 미니배치: (상태, 행동, 보상, 다음 상태, 종료 여부) 배열
+        indices = self.rng.integers(self.size, size=batch_size)
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+        )
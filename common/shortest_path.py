@@ -0,0 +1,144 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from collections import deque
+import numpy as np
+
+# 미로의 이동 표(MazeWorld.next_state_table)로 계산하는 최단 경로 도구
+#   distance_to_goal: 모든 칸에서 목표까지의 최단 걸음 수를 목표에서 거꾸로 한 번의 BFS로 계산
+#   optimal_actions, policy_optimality, is_optimal_policy: 학습한 정책이 최단 경로를 따르는지 검사
+#   heuristic_q: 거리로 계산한 Q 값(에이전트 Q 테이블의 초기값으로 사용)
+# 모든 이동의 비용이 같으므로 칸 전체의 거리는 BFS 한 번이면 충분(A*는 한 쌍의 경로만 구할 때 이점이 있음)
+
+
+def distance_to_goal(env) -> np.ndarray:
+    # 칸별 목표까지의 최단 걸음 수, (세로, 가로) int64
+    # 실패 지점을 지나거나 실패 지점에서 출발하는 경로는 쓰지 않으며, 목표에 갈 수 없는 칸은 -1
+    state_size, action_size = env.next_state_table.shape
+    goal, end = env.to_index(env.goal_state), env.to_index(env.end_state)
+
+    # 다음 상태 -> 그곳으로 이동하는 상태 목록(CSR 형식, 벽에 막혀 제자리인 이동은 제외)
+    states = np.repeat(np.arange(state_size), action_size)
+    next_states = env.next_state_table.ravel()
+    moved = states != next_states
+    states, next_states = states[moved], next_states[moved]
+    order = np.argsort(next_states, kind="stable")
+    predecessors = states[order].tolist()
+    starts = np.searchsorted(next_states[order], np.arange(state_size + 1)).tolist()
+
+    distance = [-1] * state_size
+    distance[goal] = 0
+    queue = deque([goal])
+    while queue:
+        index = queue.popleft()
+        next_distance = distance[index] + 1
+        for prev in predecessors[starts[index] : starts[index + 1]]:
+            if distance[prev] < 0 and prev != end:
+                distance[prev] = next_distance
+                queue.append(prev)
+    return np.array(distance, dtype=np.int64).reshape(env.shape)
+
+
+def shortest_path_length(env, distance=None):  # 실패 지점을 피해 시작에서 목표까지의 최단 걸음 수(없으면 None)
+    if distance is None:
+        distance = distance_to_goal(env)
+    length = int(distance[env.start_state])
+    return None if length < 0 else length
+
+
+def optimal_actions(env, distance=None) -> np.ndarray:
+    # 상태, 행동별로 목표까지의 거리를 1 줄이는 최적 행동인지, (S, A) bool
+    # (목표, 실패 지점, 목표에 갈 수 없는 칸은 모두 False)
+    if distance is None:
+        distance = distance_to_goal(env)
+    distance = distance.ravel()
+    next_distance = distance[env.next_state_table]
+    return (distance[:, None] > 0) & (next_distance == distance[:, None] - 1)
+
+
+def greedy_path_length(env, actions):  # 상태별 행동 배열을 따라갔을 때 목표까지의 걸음 수(못 가면 None)
+    actions = np.asarray(actions).ravel()
+    state, goal = env.to_index(env.start_state), env.to_index(env.goal_state)
+    for steps in range(env.state_size):
+        if env.done_table[state, actions[state]]:
+            return steps + 1 if env.next_state_table[state, actions[state]] == goal else None
+        state = env.next_state_table[state, actions[state]]
+    return None
+
+
+def is_optimal_policy(env, actions, distance=None):  # 시작에서 행동 배열을 따라가면 최단 경로로 목표에 도달하는지
+    length = shortest_path_length(env, distance)
+    return length is not None and greedy_path_length(env, actions) == length
+
+
+def policy_optimality(env, actions, distance=None):
+    # 목표에 갈 수 있는 모든 칸 중 행동 배열의 행동이 최적인 칸의 비율(시작 상태에서 닿지 않는 칸도 포함)
+    optimal = optimal_actions(env, distance)
+    actions = np.asarray(actions).ravel()
+    solvable = optimal.any(axis=1)
+    if not solvable.any():
+        return 0.0
+    return float(optimal[np.arange(len(actions)), actions][solvable].mean())
+
+
+def heuristic_q(env, gamma, distance=None, tie_break=1e-12) -> np.ndarray:
+    # 최단 경로를 따를 때의 가치로 계산한 Q, (세로, 가로, 행동 수)
+    #   V(s): 최적 행동으로 목표까지 갈 때의 할인된 보상 합(목표에 갈 수 없는 칸은 매 걸음 보상이 계속되는 값)
+    #   Q(s, a) = r(s, a) + gamma * V(s'), 종료 상태로 가는 행동은 r(s, a)
+    # 결정론적 미로에서 걸음마다 보상이 같으므로 최단 경로의 가치가 곧 최적 가치.
+    # 큰 미로에서는 gamma ** 거리가 float 정밀도 아래로 떨어져 먼 칸의 행동 가치가 모두 같아지므로,
+    # 목표에 가까운 칸으로 가는 행동일수록 tie_break * (최대 거리 - 다음 칸의 거리)를 더해 순서를 유지
+    if distance is None:
+        distance = distance_to_goal(env)
+    distance = distance.ravel()
+    state_size, action_size = env.next_state_table.shape
+
+    # 보상 shaping을 쓰는 미로는 원래 보상으로 계산한 뒤 Φ(s)를 뺌(shaping된 미로의 최적 Q는 Q - Φ(s))
+    reward_table = getattr(env, "base_reward_table", env.reward_table)
+
+    optimal = optimal_actions(env, distance.reshape(env.shape))
+    best_action = optimal.argmax(axis=1)
+    best_next = env.next_state_table[np.arange(state_size), best_action].tolist()
+    best_reward = reward_table[np.arange(state_size), best_action].tolist()
+
+    V = [0.0] * state_size
+    step_reward = reward_table[~env.done_table].max(initial=-1.0)  # 종료되지 않는 이동의 보상
+    unreachable = step_reward / (1 - gamma) if gamma < 1 else step_reward * state_size
+    for index in np.nonzero(distance < 0)[0].tolist():
+        V[index] = unreachable
+    for index in env.terminal_table.nonzero()[0].tolist():
+        V[index] = 0.0
+
+    # 거리가 짧은 칸부터 계산하면 다음 칸의 가치가 항상 먼저 계산되어 있음
+    reachable = np.nonzero(distance > 0)[0]
+    for index in reachable[np.argsort(distance[reachable], kind="stable")].tolist():
+        V[index] = best_reward[index] + gamma * V[best_next[index]]
+
+    V = np.array(V)
+    Q = reward_table + gamma * V[env.next_state_table] * ~env.done_table
+
+    next_distance = distance[env.next_state_table]
+    toward_goal = (next_distance >= 0) & ~env.done_table
+    Q += np.where(toward_goal, tie_break * (distance.max() - next_distance), 0)
+
+    if getattr(env, "potential", None) is not None:
+        Q -= env.potential.reshape(-1, 1)
+    return Q.reshape(*env.shape, action_size)
+
+
+if __name__ == "__main__":
+    import time
+    from common.mazeworld import MazeWorld
+    from common.maze_generator import generate_maze
+
+    env = MazeWorld(**generate_maze(500, 500, braid_factor=0.2, seed=0))
+
+    start_time = time.time()
+    distance = distance_to_goal(env)
+    print(f"distance map in {time.time() - start_time:.2f}s, shortest path {shortest_path_length(env, distance)}")
+
+    Q = heuristic_q(env, 0.9, distance)
+    actions = Q.argmax(axis=-1)
+    print("heuristic Q optimal:", is_optimal_policy(env, actions, distance), policy_optimality(env, actions, distance))
@@ -0,0 +1,233 @@
+import os
+from collections import deque
+import numpy as np
+from common.checkpoint import save_checkpoint, load_checkpoint
+
+# 저장소의 에이전트들은 학습 방식에 따라 서로 다른 메서드로 환경과 상호작용하므로
+# 각 방식별로 에피소드 하나를 진행하는 함수를 두고, 에이전트의 runner 속성("q", "sarsa", "mc", "td")이
+# 있으면 그것으로, 없으면 에이전트의 메서드를 보고 선택함
+
+
+def run_q_episode(env, agent, max_steps=None):  # update(s, a, r, s', done): Q 학습
+    state = env.reset()
+    if hasattr(agent, "reset"):
+        agent.reset()
+    steps, total_reward = 0, 0
+
+    while True:
+        action = agent.get_action(state)
+        next_state, reward, done = env.step(action)
+        agent.update(state, action, reward, next_state, done)
+        steps, total_reward = steps + 1, total_reward + reward
+
+        if done or env.truncated or steps == max_steps:  # 잘린 경우 update에서 이미 다음 상태로 부트스트랩함
+            break
+        state = next_state
+
+    return steps, total_reward
+
+
+def run_sarsa_episode(env, agent, max_steps=None):  # update(s, a, r, done): SARSA
+    state = env.reset()
+    agent.reset()
+    steps, total_reward = 0, 0
+
+    while True:
+        action = agent.get_action(state)
+        next_state, reward, done = env.step(action)
+        agent.update(state, action, reward, done)
+        steps, total_reward = steps + 1, total_reward + reward
+
+        if done:
+            agent.update(next_state, None, None, None)
+            break
+        if env.truncated or steps == max_steps:  # 잘린 에피소드는 다음 상태에서 고른 행동의 Q로 마지막 전이를 갱신
+            agent.update(next_state, agent.get_action(next_state), None, None)
+            break
+        state = next_state
+
+    return steps, total_reward
+
+
+def run_mc_episode(env, agent, max_steps=None):  # add(s, a, r) 후 에피소드 끝에 update/eval: 몬테카를로
+    state = env.reset()
+    agent.reset()
+    steps, total_reward = 0, 0
+    end_of_episode = agent.update if hasattr(agent, "update") else agent.eval
+
+    while True:
+        action = agent.get_action(state)
+        next_state, reward, done = env.step(action)
+        agent.add(state, action, reward)
+        steps, total_reward = steps + 1, total_reward + reward
+
+        if done or env.truncated or steps == max_steps:  # 잘린 에피소드는 그때까지의 보상으로만 수익 계산
+            end_of_episode()
+            break
+        state = next_state
+
+    return steps, total_reward
+
+
+def run_td_episode(env, agent, max_steps=None):  # eval(s, r, s', done) 또는 eval_nstep: TD 평가
+    state = env.reset()
+    if hasattr(agent, "reset"):
+        agent.reset()
+    steps, total_reward = 0, 0
+    evaluate = agent.eval_nstep if hasattr(agent, "eval_nstep") else agent.eval
+
+    while True:
+        action = agent.get_action(state)
+        next_state, reward, done = env.step(action)
+        evaluate(state, reward, next_state, done)
+        steps, total_reward = steps + 1, total_reward + reward
+
+        if done or env.truncated or steps == max_steps:
+            break
+        state = next_state
+
+    return steps, total_reward
+
+
+RUNNERS = {
+    "q": run_q_episode,
+    "sarsa": run_sarsa_episode,
+    "mc": run_mc_episode,
+    "td": run_td_episode,
+}
+
+
+def episode_runner(agent):  # 에이전트에 맞는 에피소드 진행 함수 선택
+    runner = getattr(agent, "runner", None)
+    if runner is not None:
+        if runner not in RUNNERS:
+            raise ValueError(f"unknown runner {runner!r}, expected one of {sorted(RUNNERS)}")
+        return RUNNERS[runner]
+    if hasattr(agent, "add"):
+        return run_mc_episode
+    if hasattr(agent, "eval") or hasattr(agent, "eval_nstep"):
+        return run_td_episode
+    if hasattr(agent, "reset"):
+        return run_sarsa_episode
+    return run_q_episode
+
+
+def agent_values(env, agent):  # 에이전트의 가치(Q 또는 V)를 배열로, 가치가 없으면 None
+    Q = getattr(agent, "Q", None)
+    if Q is not None:
+        return Q.table if hasattr(Q, "table") else np.asarray(Q)
+    V = getattr(agent, "V", None)
+    if isinstance(V, np.ndarray):
+        return V
+    if isinstance(V, dict):
+        values = np.zeros(env.shape)
+        for state, value in V.items():
+            values[state] = value
+        return values
+    return None
+
+
+class ConvergenceMonitor:
+    # 에피소드마다 호출되어 수렴 여부를 판단(train의 convergence 인자로 전달)
+    #   patience: Q의 그리디 정책이 이 에피소드 수만큼 연속으로 바뀌지 않으면 수렴
+    #   tolerance: 최근 window 에피소드 동안 에피소드별 최대 |ΔQ|(V 평가 에이전트는 |ΔV|)가 모두 이보다 작으면 수렴
+    # 둘 다 주면 두 조건을 모두 만족해야 수렴. 수렴하면 episode(몇 번째 에피소드까지 학습했는지)와 reason을 기록
+    def __init__(self, env, agent, patience=None, tolerance=None, window=10):
+        if patience is None and tolerance is None:
+            raise ValueError("patience or tolerance is required")
+        self.env = env
+        self.agent = agent
+        self.patience = patience
+        self.tolerance = tolerance
+        self.window = window
+
+        self.episode = None
+        self.reason = None
+        self.stable_episodes = 0  # 그리디 정책이 연속으로 바뀌지 않은 에피소드 수
+        self.deltas = deque(maxlen=window)  # 최근 에피소드별 최대 가치 변화량
+
+        values = agent_values(env, agent)
+        if patience is not None and (values is None or values.ndim != 3):
+            raise ValueError("patience requires an agent with a Q table")
+        if tolerance is not None and values is None:
+            raise ValueError("tolerance requires an agent with Q or V")
+        self.last_values = None if values is None else values.copy()
+        self.last_greedy = None if patience is None else values.argmax(axis=-1)
+
+    def __call__(self, episode):  # 에피소드가 끝날 때마다 호출, 수렴했으면 True
+        values = agent_values(self.env, self.agent)
+        reasons = []
+
+        if self.patience is not None:
+            greedy = values.argmax(axis=-1)
+            if np.array_equal(greedy, self.last_greedy):
+                self.stable_episodes += 1
+            else:
+                self.stable_episodes = 0
+                self.last_greedy = greedy
+            if self.stable_episodes < self.patience:
+                reasons = None
+            else:
+                reasons.append(f"greedy policy unchanged for {self.stable_episodes} episodes")
+
+        if self.tolerance is not None:
+            self.deltas.append(np.abs(values - self.last_values).max())
+            self.last_values[...] = values
+            if reasons is not None and len(self.deltas) == self.window and max(self.deltas) < self.tolerance:
+                name = "Q" if values.ndim == 3 else "V"
+                reasons.append(f"max |Δ{name}| {max(self.deltas):.2e} < {self.tolerance} over {self.window} episodes")
+            else:
+                reasons = None
+
+        if not reasons:
+            return False
+        self.episode = episode + 1
+        self.reason = ", ".join(reasons)
+        return True
+
+    def summary(self, episodes):  # 학습이 끝난 뒤 멈춘 시점과 이유
+        if self.reason is None:
+            return f"not converged after {episodes} episodes"
+        return f"converged at episode {self.episode}: {self.reason}"
+
+
+def train(
+    env,
+    agent,
+    episodes,
+    max_steps=None,
+    callback=None,
+    checkpoint=None,
+    checkpoint_every=100,
+    convergence=None,
+):
+    # max_steps는 에피소드 최대 걸음 수(env.max_steps와 같은 역할로, 둘 중 먼저 걸리는 쪽에서 자름)
+    # callback(episode, steps, total_reward)가 True를 반환하면 학습 중단
+    # convergence(ConvergenceMonitor 등)를 주면 수렴한 에피소드에서 멈추므로 episodes는 최대 에피소드 수
+    # checkpoint 경로를 주면 checkpoint_every 에피소드마다와 끝날 때 저장하고,
+    # 파일이 이미 있으면 저장된 에피소드부터 이어서 학습(episodes는 전체 에피소드 수)
+    # 목표와 실패 지점 모두 도달할 수 없는 미로는 걸음 수 제한이 없으면 에피소드가 끝나지 않음
+    if not env.terminable and env.max_steps is None and max_steps is None:
+        raise ValueError("no terminal state is reachable from the start; set max_steps")
+
+    run_episode = episode_runner(agent)
+    history = []
+
+    start_episode = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        start_episode = load_checkpoint(checkpoint, agent)
+
+    for episode in range(start_episode, episodes):
+        steps, total_reward = run_episode(env, agent, max_steps)
+        history.append((steps, total_reward))
+
+        stop = callback is not None and callback(episode, steps, total_reward)
+        stop = (convergence is not None and convergence(episode)) or stop
+        if checkpoint is not None and (
+            stop or episode + 1 == episodes or (episode + 1) % checkpoint_every == 0
+        ):
+            save_checkpoint(checkpoint, agent, episode + 1)
+        if stop:
+            break
+
+    return history
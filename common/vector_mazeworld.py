@@ -0,0 +1,65 @@
+if "__file__" in globals():
+    import os, sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+from common.mazeworld import MazeWorld
+
+
+class VectorMazeWorld:
+    def __init__(self, env: MazeWorld, num_envs: int):
+        self.env = env  # 컴파일된 표를 공유할 MazeWorld
+        self.num_envs = num_envs  # 동시에 진행할 에이전트 수
+
+        self.next_state_table = env.next_state_table
+        self.reward_table = env.reward_table
+        self.done_table = env.done_table
+        self.start_index = env.to_index(env.start_state)
+        self.max_steps = env.max_steps  # 에피소드 최대 걸음 수(MazeWorld와 같음)
+
+        # 모든 에이전트의 현재 상태 번호와 이번 에피소드의 걸음 수
+        self.agent_states = np.full(num_envs, self.start_index, dtype=np.int64)
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+        self.truncated = np.zeros(num_envs, dtype=bool)  # 마지막 step에서 max_steps에 걸린 에이전트
+
+    def actions(self):  # 모든 행동 반환
+        return self.env.actions()
+
+    def reset(self):  # 모든 에이전트 위치 초기화
+        self.agent_states[:] = self.start_index
+        self.elapsed_steps[:] = 0
+        self.truncated[:] = False
+        return self.agent_states.copy()
+
+    def step(self, actions):  # 모든 에이전트를 한 번에 이동
+        states = self.agent_states
+        next_states = self.next_state_table[states, actions]
+        rewards = self.reward_table[states, actions]
+        dones = self.done_table[states, actions]
+
+        self.elapsed_steps += 1
+        if self.max_steps is not None:
+            self.truncated = ~dones & (self.elapsed_steps >= self.max_steps)
+
+        # 과제가 끝났거나 잘린 에이전트는 시작 상태로 자동 초기화
+        # (반환값 next_states에는 초기화 전 도착 상태가 담김)
+        finished = dones | self.truncated
+        self.agent_states = np.where(finished, self.start_index, next_states)
+        self.elapsed_steps[finished] = 0
+        return next_states, rewards, dones
+
+
+if __name__ == "__main__":
+    env = MazeWorld()
+    vec_env = VectorMazeWorld(env, num_envs=1000)
+
+    steps = 1000
+    finished = 0
+    vec_env.reset()
+    for step in range(steps):
+        actions = np.random.randint(len(env.actions()), size=vec_env.num_envs)
+        next_states, rewards, dones = vec_env.step(actions)
+        finished += dones.sum()
+
+    print(f"{steps * vec_env.num_envs} steps, {finished} episodes finished")
@@ -0,0 +1,190 @@
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from common.mazeworld import MazeWorld
+
+# MazeWorld의 컴파일된 표(next_state_table, reward_table)를 이용해
+# 모든 상태에 대한 벨만 업데이트를 한 번의 배열 연산으로 수행하는 DP 엔진.
+# V는 (S,) 배열, 확률적 정책은 (S, A) 확률 배열, 결정적 정책은 (S,) 행동 배열로 표현.
+
+
+def action_values(V, env, gamma):  # 모든 (상태, 행동)의 r + gamma * V(s'), (S, A)
+    V = np.where(env.terminal_table, 0, V)
+    return env.reward_table + gamma * V[env.next_state_table]
+
+
+def eval_onestep(pi, V, env, gamma=0.9):  # 벨만 기대 방정식 1회 적용
+    if pi.ndim == 1:
+        new_V = np.take_along_axis(action_values(V, env, gamma), pi[:, None], 1)[:, 0]
+    else:
+        new_V = (pi * action_values(V, env, gamma)).sum(axis=1)
+    new_V[env.terminal_table] = 0
+    return new_V
+
+
+def value_iter_onestep(V, env, gamma):  # 벨만 최적 방정식 1회 적용
+    new_V = action_values(V, env, gamma).max(axis=1)
+    new_V[env.terminal_table] = 0
+    return new_V
+
+
+def greedy_policy(V, env, gamma):  # V에 대한 그리디 정책, (S,) 행동 배열
+    return action_values(np.ravel(V), env, gamma).argmax(axis=1)
+
+
+def policy_eval(pi, V, env, gamma, threshold=0.001):
+    while True:
+        new_V = eval_onestep(pi, V, env, gamma)
+        delta = np.abs(new_V - V).max()
+        V = new_V
+
+        if delta < threshold:
+            break
+
+    return V
+
+
+def policy_system(pi, env, gamma):  # (I - gamma * P_pi) V = r_pi 연립방정식 구성
+    # 각 행의 0이 아닌 원소가 최대 A + 1개(대각 + 행동별 다음 상태)이므로
+    # 행마다 고정 길이의 (열 번호, 값)을 저장하는 ELL 희소 행렬로 표현
+    state_size, action_size = pi.shape
+    states = np.arange(state_size)
+
+    indices = np.empty((state_size, action_size + 1), dtype=np.int64)
+    data = np.empty((state_size, action_size + 1))
+    indices[:, 0], data[:, 0] = states, 1
+    indices[:, 1:], data[:, 1:] = env.next_state_table, -gamma * pi
+    b = (pi * env.reward_table).sum(axis=1)
+
+    # 종료 상태는 V = 0
+    data[env.terminal_table, 1:] = 0
+    b[env.terminal_table] = 0
+
+    return indices, data, b
+
+
+def bicgstab(indices, data, b, x=None, tol=1e-10, max_iter=10000):  # ELL 희소 행렬용 BiCGSTAB
+    def matvec(v):
+        return (data * v[indices]).sum(axis=1)
+
+    x = np.zeros_like(b) if x is None else x.copy()
+    b_norm = np.linalg.norm(b)
+    if b_norm == 0:
+        return np.zeros_like(b)
+
+    r = b - matvec(x)
+    r_hat = r.copy()
+    rho = alpha = omega = 1.0
+    v = p = np.zeros_like(b)
+
+    for _ in range(max_iter):
+        rho_new = r_hat @ r
+        if rho_new == 0:  # 더 이상 진행할 수 없음
+            break
+        beta = (rho_new / rho) * (alpha / omega)
+        p = r + beta * (p - omega * v)
+        v = matvec(p)
+        alpha = rho_new / (r_hat @ v)
+        s = r - alpha * v
+        if np.linalg.norm(s) < tol * b_norm:
+            x += alpha * p
+            break
+
+        t = matvec(s)
+        omega = (t @ s) / (t @ t)
+        x += alpha * p + omega * s
+        r = s - omega * t
+        if np.linalg.norm(r) < tol * b_norm:
+            break
+        rho = rho_new
+
+    return x
+
+
+def deterministic_solve(pi, env, gamma, tol=1e-10):  # 결정적 정책의 V를 직접 계산
+    # V(s) = sum_k gamma^k r(s_k) 를 포인터 점프로 계산: j번째 반복 후
+    # acc(s)는 처음 2^j 단계의 할인 보상 합, ptr(s)는 2^j 단계 뒤의 상태
+    states = np.arange(env.state_size)
+    ptr = env.next_state_table[states, pi]
+    acc = env.reward_table[states, pi].astype(float)
+
+    # 종료 상태는 보상 0으로 자기 자신에 머무름
+    ptr[env.terminal_table] = states[env.terminal_table]
+    acc[env.terminal_table] = 0
+
+    reward_max = np.abs(acc).max()
+    mult = gamma
+    for _ in range(64):
+        if env.terminal_table[ptr].all():  # 모든 경로가 종료 상태에 도달(정확한 해)
+            break
+        if mult * reward_max / (1 - gamma) < tol:  # 남은 꼬리의 크기가 충분히 작음
+            break
+        acc = acc + mult * acc[ptr]
+        ptr = ptr[ptr]
+        mult *= mult
+
+    return acc
+
+
+def policy_eval_exact(pi, env, gamma, tol=1e-10):  # 반복 없이 한 번의 풀이로 정책 평가
+    if pi.ndim == 2 and (pi.max(axis=1) == 1).all():  # 원-핫 확률 정책은 결정적 정책
+        pi = pi.argmax(axis=1)
+
+    if pi.ndim == 1:
+        return deterministic_solve(pi, env, gamma, tol)
+
+    indices, data, b = policy_system(pi, env, gamma)
+    return bicgstab(indices, data, b, tol=tol)
+
+
+def value_iter(V, env, gamma, threshold=0.001, is_render=True):
+    V = np.zeros(env.state_size) if V is None else np.ravel(V).astype(float)
+
+    while True:
+        new_V = value_iter_onestep(V, env, gamma)
+        delta = np.abs(new_V - V).max()
+        V = new_V
+
+        if delta < threshold:
+            break
+
+    V = V.reshape(env.shape)
+    if is_render:
+        env.render_v(V)
+
+    return V
+
+
+def policy_iter(env, gamma, threshold=0.001, is_render=True, exact=False):
+    action_size = len(env.actions())
+    pi = np.full((env.state_size, action_size), 1 / action_size)
+    V = np.zeros(env.state_size)
+
+    while True:
+        if exact:
+            V = policy_eval_exact(pi, env, gamma)
+        else:
+            V = policy_eval(pi, V, env, gamma, threshold)
+        new_pi = greedy_policy(V, env, gamma)
+
+        if pi.ndim == 1 and np.array_equal(new_pi, pi):
+            break
+        pi = new_pi
+
+    V, pi = V.reshape(env.shape), pi.reshape(env.shape)
+    if is_render:
+        env.render_v(V, pi)
+
+    return pi
+
+
+if __name__ == '__main__':
+    env = MazeWorld()
+    gamma = 0.9
+
+    V = value_iter(None, env, gamma, is_render=False)
+    pi = greedy_policy(V, env, gamma).reshape(env.shape)
+    env.render_v(V, pi)
+
+    pi = policy_iter(env, gamma, exact=True)
@@ -2,8 +2,8 @@ if '__file__' in globals():
     import os, sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from collections import defaultdict
-from common.mazeworld import MazeWorld
+import numpy as np
+from dynamic_programming.dp_array import policy_eval_exact
 
 def eval_onestep(pi, V, env, gamma=0.9):
     for state in env.states():
@@ -24,7 +24,18 @@ def eval_onestep(pi, V, env, gamma=0.9):
 
     return V
 
-def policy_eval(pi, V, env, gamma, threshold=0.001):
+def policy_eval(pi, V, env, gamma, threshold=0.001, exact=False):
+    if exact:  # (I - gamma * P_pi) V = r_pi 를 한 번에 풀이
+        pi_array = np.zeros((env.state_size, len(env.actions())))
+        for state in env.states():
+            for action, action_prob in pi[state].items():
+                pi_array[env.to_index(state), action] = action_prob
+
+        V_array = policy_eval_exact(pi_array, env, gamma)
+        for state in env.states():
+            V[state] = V_array[env.to_index(state)]
+        return V
+
     while True:
         old_V = V.copy()
         V = eval_onestep(pi, V, env, gamma)
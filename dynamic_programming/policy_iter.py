@@ -34,12 +34,12 @@ def greedy_policy(V, env, gamma):
 
     return pi
 
-def policy_iter(env, gamma, threshold=0.001, is_render=True):
+def policy_iter(env, gamma, threshold=0.001, is_render=True, exact=False):
     pi = defaultdict(lambda: {0: 0.25, 1: 0.25, 2: 0.25, 3: 0.25})
     V = defaultdict(lambda: 0)
 
     while True:
-        V = policy_eval(pi, V, env, gamma, threshold)
+        V = policy_eval(pi, V, env, gamma, threshold, exact)
         new_pi = greedy_policy(V, env, gamma)
 
         if new_pi == pi:
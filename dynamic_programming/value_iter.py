@@ -1,9 +1,12 @@
 if '__file__' in globals():
     import os, sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import heapq
 from collections import defaultdict
+import numpy as np
 from common.mazeworld import MazeWorld
 from dynamic_programming.policy_iter import greedy_policy
+from dynamic_programming.dp_array import action_values
 
 def value_iter_onestep(V, env, gamma):
     for state in env.states():
@@ -22,7 +25,68 @@ def value_iter_onestep(V, env, gamma):
     
     return V
 
-def value_iter(V, env, gamma, threshold=0.001, is_render=True):
+def predecessors(env):  # 역방향 전이 색인: 상태 s로 이동할 수 있는 상태들, CSR 형태
+    state_size, action_size = env.next_state_table.shape
+    next_states = env.next_state_table.ravel()
+    states = np.repeat(np.arange(state_size), action_size)
+
+    pairs = np.unique(next_states * state_size + states)  # 중복 (s, 이전 상태) 제거
+    next_states, states = np.divmod(pairs, state_size)
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(next_states, minlength=state_size))))
+
+    return indptr.tolist(), states.tolist()
+
+
+def prioritized_value_iter(V, env, gamma, threshold=0.001):
+    # 벨만 오차가 큰 상태부터 갱신하고, 값이 바뀐 상태의 이전 상태들만 다시 검사하는 비동기 가치 반복
+    if V is None:  # 목표에 도달하지 못하는 경우의 값으로 시작하면 목표 주변부터 퍼져 나감
+        values = np.full(env.state_size, -1 / (1 - gamma))
+    else:
+        values = np.array([V[state] for state in env.states()], dtype=float)
+    values[env.terminal_table] = 0
+
+    errors = np.abs(action_values(values, env, gamma).max(axis=1) - values)
+    errors[env.terminal_table] = 0
+    queue = [(-errors[s], s) for s in np.flatnonzero(errors > threshold).tolist()]
+    heapq.heapify(queue)
+
+    indptr, preds = predecessors(env)
+    next_state_list = env.next_state_table.tolist()
+    reward_list = env.reward_table.tolist()
+    terminal_list = env.terminal_table.tolist()
+    values = values.tolist()
+
+    def backup(s):
+        return max(r + gamma * values[n] for n, r in zip(next_state_list[s], reward_list[s]))
+
+    while queue:
+        _, s = heapq.heappop(queue)
+        new_value = backup(s)
+        if abs(new_value - values[s]) <= threshold:  # 이미 갱신된 중복 항목
+            continue
+        values[s] = new_value
+
+        for p in preds[indptr[s]:indptr[s + 1]]:
+            if terminal_list[p]:
+                continue
+            error = abs(backup(p) - values[p])
+            if error > threshold:
+                heapq.heappush(queue, (-error, p))
+
+    V = {} if V is None else V
+    for state, value in zip(env.states(), values):
+        V[state] = value
+
+    return V
+
+
+def value_iter(V, env, gamma, threshold=0.001, is_render=True, prioritized=False):
+    if prioritized:
+        V = prioritized_value_iter(V or None, env, gamma, threshold)
+        if is_render:
+            env.render_v(V)
+        return V
+
     while True:
 
         old_V = V.copy()
@@ -1,13 +1,20 @@
 from typing import Any
 from collections.abc import Callable
+import queue
+import threading
+import tkinter.messagebox as msgbox
 import ttkbootstrap as ttk
+from common.maze_generator import ALGORITHMS, generate_mask
+from common.maze_format import POINTS
 from .wall_builder import WallBuilder
-from .pages import InitPage, WallPage, StartPage, GoalPage, EndPage
+from .pages import InitPage, WallPage, StartPage, GoalPage, EndPage, TrainPage, FILE_MAZE
 import time
 
 WINDOW_SIZE = 700
 MINROW = MINCOL = 3
-MAXROW = MAXCOL = 11
+MAXROW = MAXCOL = 1001
+EMPTY_MAZE = "empty"  # 벽 없이 시작(그 밖의 선택지는 미로 생성 알고리즘)
+POLL_INTERVAL = 100  # 학습 진행 상황 확인 주기(ms)
 
 
 class MainWindow:
@@ -17,12 +24,20 @@ class MainWindow:
         size: int = 700,  # 창 크기
         row_cnt: tuple[int, int] = (MINROW, MAXROW),  # 미로 열 개수 상/하한
         col_cnt: tuple[int, int] = (MINCOL, MAXCOL),  # 미로 행 개수 상/하한
-        on_finish: Callable[[dict[str, Any]], None] = None,  # 완료시 호출할 함수
+        on_finish: Callable[[Any], None] = None,  # 완료시 호출할 함수
+        # 창을 유지한 채 작업 스레드에서 실행할 학습 함수: (미로 데이터, 진행 상황 보고 함수, 취소 이벤트) -> 결과
+        # 지정하면 on_finish는 미로 데이터 대신 학습 결과를 받음
+        on_train: Callable[
+            [dict[str, Any], Callable[[dict[str, Any]], None], threading.Event], Any
+        ] = None,
+        train_episodes: int = 1000,  # 진행 막대에 표시할 전체 에피소드 수
     ) -> "MainWindow":
         self.__size = size
         self.__row_cnt = row_cnt
         self.__col_cnt = col_cnt
         self.__on_finish = on_finish
+        self.__on_train = on_train
+        self.__train_episodes = train_episodes
         self.__result = {}
 
         # 윈도우 생성
@@ -41,7 +56,11 @@ class MainWindow:
 
         # 페이지 설정
         self.__pages = [
-            InitPage(self.__root, self.__main_label, {"row": row_cnt, "col": col_cnt}),
+            InitPage(
+                self.__root,
+                self.__main_label,
+                {"row": row_cnt, "col": col_cnt, "maze": [EMPTY_MAZE, *ALGORITHMS, FILE_MAZE]},
+            ),
             WallPage(self.__root, self.__main_label),
             StartPage(self.__root, self.__main_label),
             GoalPage(self.__root, self.__main_label),
@@ -66,6 +85,14 @@ class MainWindow:
         # TODO: Wall Builder 부분이 만들고 넘기는 부분이 너무 중구난방임.
         data = page.extract_data()
         if self.__now_page == 0:
+            mask, points = None, {}
+            if data["maze"] == FILE_MAZE:
+                maze = data["maze_data"]  # InitPage에서 읽고 크기를 확인한 파일
+                mask, points = maze["mask"], {name: maze[name] for name in POINTS}
+                data["row"], data["col"] = mask.shape
+            elif data["maze"] != EMPTY_MAZE:
+                mask = generate_mask(int(data["row"]), int(data["col"]), data["maze"])
+
             self.__wall_builder = WallBuilder(
                 self.__root,
                 int(data["row"]),
@@ -73,14 +100,72 @@ class MainWindow:
                 width=(self.__size - 200),
                 height=(self.__size - 200),
             )
+            if mask is not None:
+                self.__wall_builder.load_mask(mask)
+            self.__wall_builder.load_points(**points)  # 파일의 지점은 지점 선택 페이지에서 미리 선택됨
         else:
             self.__result.update(data)
 
         if self.__now_page == len(self.__pages) - 1:
-            self.__root.quit()
-            self.__root.destroy()
-            self.__on_finish(self.__result)
+            if self.__on_train is None:
+                self.__finish(self.__result)
+            else:
+                self.__start_training()
             return
 
         self.__now_page += 1
         self.__pages[self.__now_page].show(self.__wall_builder)
+
+    # 창을 닫고 완료 함수 호출
+    def __finish(self, result: Any) -> None:
+        self.__root.quit()
+        self.__root.destroy()
+        self.__on_finish(result)
+
+    # 작업 스레드에서 학습을 시작하고 진행 상황을 주기적으로 확인
+    def __start_training(self) -> None:
+        self.__main_button.config(state="disabled")
+        self.__progress_queue = queue.Queue()
+        self.__cancel_event = threading.Event()
+
+        self.__train_page = TrainPage(self.__root, self.__main_label)
+        self.__train_page.show(self.__train_episodes, on_cancel=self.__cancel_event.set)
+
+        threading.Thread(target=self.__train_worker, daemon=True).start()
+        self.__root.after(POLL_INTERVAL, self.__poll_progress)
+
+    def __train_worker(self) -> None:
+        try:
+            result = self.__on_train(
+                self.__result,
+                lambda progress: self.__progress_queue.put(("progress", progress)),
+                self.__cancel_event,
+            )
+            self.__progress_queue.put(("done", result))
+        except Exception as error:
+            self.__progress_queue.put(("error", error))
+
+    def __poll_progress(self) -> None:
+        # 쌓인 보고 중 가장 최근 진행 상황만 화면에 표시
+        progress = None
+        while True:
+            try:
+                kind, value = self.__progress_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                progress = value
+            elif kind == "done":
+                self.__train_page.dismiss()
+                self.__finish(value)
+                return
+            else:
+                msgbox.showerror("Error", f"Training failed: {value}")
+                self.__root.quit()
+                self.__root.destroy()
+                return
+
+        if progress is not None:
+            self.__train_page.update(progress)
+        self.__root.after(POLL_INTERVAL, self.__poll_progress)
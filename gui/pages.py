@@ -1,11 +1,24 @@
 # 클래스별로 파일을 분리하는 게 좋을까요?
 
 from typing import Any
+from collections.abc import Callable
+import tkinter.filedialog as filedialog
 import tkinter.messagebox as msgbox
 import ttkbootstrap as ttk
+from common.maze_format import load_maze
 from .wall_builder import WallBuilder
 from .design_option import DesignOption
 
+FILE_MAZE = "file..."  # 미로 파일을 골라 불러오기
+MAZE_FILE_TYPES = [("Maze files", "*.maze"), ("All files", "*")]
+
+
+# 미로 파일에서 불러온 지점이 있으면 미리 선택해 둠(다른 칸을 클릭해 바꿀 수 있음)
+def select_loaded_point(wall_builder: WallBuilder, name: str) -> None:
+    point = wall_builder.loaded_points[name]
+    if point is not None:
+        wall_builder.select_area(*point)
+
 
 class Page:
     def __init__(
@@ -50,30 +63,72 @@ class InitPage(Page):
         self.__frame = ttk.Frame(self.root)
         self.__frame.pack(pady=10)
 
-        self.__row = ttk.Combobox(
-            self.__frame,
-            state="readonly",
-            values=[i for i in range(*self.options["row"])],
+        # 큰 미로도 고를 수 있도록 목록 대신 숫자 입력
+        self.__row = ttk.Spinbox(
+            self.__frame, from_=self.options["row"][0], to=self.options["row"][1] - 1, width=8
         )
         label = ttk.Label(self.__frame, text="X")
-        self.__col = ttk.Combobox(
-            self.__frame,
-            state="readonly",
-            values=[i for i in range(*self.options["col"])],
+        self.__col = ttk.Spinbox(
+            self.__frame, from_=self.options["col"][0], to=self.options["col"][1] - 1, width=8
+        )
+        # 빈 미로에서 시작하거나 생성한 미로를 불러와 편집
+        self.__maze = ttk.Combobox(
+            self.__frame, state="readonly", values=self.options["maze"], width=12
         )
 
-        self.__row.current(0)
-        self.__col.current(0)
+        self.__path = None
+        self.__maze_data = None  # 불러온 미로 파일의 데이터(load_maze 결과)
+
+        self.__row.set(self.options["row"][0])
+        self.__col.set(self.options["col"][0])
+        self.__maze.current(0)
         self.__row.pack(padx=10, side=ttk.LEFT)
         label.pack(padx=10, side=ttk.LEFT)
         self.__col.pack(padx=10, side=ttk.LEFT)
+        self.__maze.pack(padx=10, side=ttk.LEFT)
 
     def dismiss(self) -> bool:
+        if self.__maze.get() == FILE_MAZE:  # 크기는 파일을 따름
+            self.__path = filedialog.askopenfilename(filetypes=MAZE_FILE_TYPES)
+            if not self.__path:
+                return False
+
+            # 페이지를 닫기 전에 읽어 보고, 잘못된 파일이거나 크기가 범위 밖이면 이 페이지에 머무름
+            try:
+                self.__maze_data = load_maze(self.__path)
+            except (OSError, ValueError) as error:
+                msgbox.showerror("Error", str(error))
+                return False
+            for name, size in zip(("row", "col"), self.__maze_data["mask"].shape):
+                low, high = self.options[name]
+                if not low <= size < high:
+                    msgbox.showerror("Error", f"The size must be between {low} and {high - 1}.")
+                    return False
+
+            self.__frame.pack_forget()
+            return True
+
+        for name, spinbox in (("row", self.__row), ("col", self.__col)):
+            low, high = self.options[name]
+            try:
+                value = int(spinbox.get())
+            except ValueError:
+                value = None
+            if value is None or not low <= value < high:
+                msgbox.showerror("Error", f"The size must be between {low} and {high - 1}.")
+                return False
+
         self.__frame.pack_forget()
         return True
 
     def extract_data(self) -> dict[str, Any]:
-        return {"row": int(self.__row.get()), "col": int(self.__col.get())}
+        return {
+            "row": int(self.__row.get()),
+            "col": int(self.__col.get()),
+            "maze": self.__maze.get(),
+            "path": self.__path,
+            "maze_data": self.__maze_data,
+        }
 
 
 class WallPage(Page):
@@ -84,12 +139,38 @@ class WallPage(Page):
         super().show()
         self.__wall_builder = wall_builder
 
+        self.__frame = ttk.Frame(self.root)
+        self.__frame.pack(pady=5)
+        ttk.Button(
+            self.__frame, text="Save", bootstyle="secondary", command=self.__save
+        ).pack(padx=5, side=ttk.LEFT)
+        ttk.Button(
+            self.__frame, text="Load", bootstyle="secondary", command=self.__load
+        ).pack(padx=5, side=ttk.LEFT)
+
     def dismiss(self) -> bool:
+        self.__frame.pack_forget()
         self.__wall_builder.change_click_event()
         return True
 
     def extract_data(self) -> dict[str, Any]:
-        return {"directions": self.__wall_builder.get_movement_data()}
+        return {"mask": self.__wall_builder.get_mask()}
+
+    def __save(self) -> None:
+        path = filedialog.asksaveasfilename(
+            defaultextension=".maze", filetypes=MAZE_FILE_TYPES
+        )
+        if path:
+            self.__wall_builder.save(path)
+
+    def __load(self) -> None:
+        path = filedialog.askopenfilename(filetypes=MAZE_FILE_TYPES)
+        if not path:
+            return
+        try:
+            self.__wall_builder.load(path)
+        except ValueError as error:
+            msgbox.showerror("Error", str(error))
 
 
 class StartPage(Page):
@@ -99,6 +180,7 @@ class StartPage(Page):
     def show(self, wall_builder: WallBuilder) -> None:
         super().show()
         self.__wall_builder = wall_builder
+        select_loaded_point(wall_builder, "start")
 
     def dismiss(self) -> bool:
         if self.__wall_builder.selected_area is None:
@@ -107,6 +189,7 @@ class StartPage(Page):
         self.__wall_builder.add_marking(
             *self.__wall_builder.selected_area,
             color=self.design_option.primary_color,
+            name="start",
         )
         return True
 
@@ -123,6 +206,7 @@ class GoalPage(Page):
     def show(self, wall_builder: WallBuilder) -> None:
         super().show()
         self.__wall_builder = wall_builder
+        select_loaded_point(wall_builder, "goal")
 
     def dismiss(self) -> bool:
         if self.__wall_builder.selected_area is None:
@@ -131,6 +215,7 @@ class GoalPage(Page):
         self.__wall_builder.add_marking(
             *self.__wall_builder.selected_area,
             color=self.design_option.secondary_color,
+            name="goal",
         )
         return True
 
@@ -147,6 +232,7 @@ class EndPage(Page):
     def show(self, wall_builder: WallBuilder) -> None:
         super().show()
         self.__wall_builder = wall_builder
+        select_loaded_point(wall_builder, "end")
 
     def dismiss(self) -> bool:
         if self.__wall_builder.selected_area is None:
@@ -155,6 +241,7 @@ class EndPage(Page):
         self.__wall_builder.add_marking(
             *self.__wall_builder.selected_area,
             color=self.design_option.tertiary_color,
+            name="end",
         )
         return True
 
@@ -162,3 +249,45 @@ class EndPage(Page):
         data = {"end": self.__wall_builder.selected_area}
         self.__wall_builder.reset_temp_marking()
         return data
+
+
+class TrainPage(Page):
+    def __init__(self, root: ttk.Window, label: ttk.Label) -> "TrainPage":
+        super().__init__(root, label, "Training the agent...")
+
+    def show(self, episodes: int, on_cancel: Callable[[], None]) -> None:
+        super().show()
+        self.__on_cancel = on_cancel
+        self.__frame = ttk.Frame(self.root)
+        self.__frame.pack(pady=10)
+
+        self.__progressbar = ttk.Progressbar(
+            self.__frame, maximum=episodes, length=400, bootstyle="success"
+        )
+        self.__status = ttk.Label(self.__frame, text="")
+        self.__cancel_button = ttk.Button(
+            self.__frame, text="Cancel", bootstyle="danger", command=self.__cancel
+        )
+
+        self.__progressbar.pack(pady=5)
+        self.__status.pack(pady=5)
+        self.__cancel_button.pack(pady=5)
+
+    # 학습 진행 상황(에피소드, 걸음 수, 보상 합, 최대 Q 변화량) 표시
+    def update(self, progress: dict[str, Any]) -> None:
+        self.__progressbar.config(value=progress["episode"])
+        self.__status.config(
+            text=(
+                f"Episode {progress['episode']}/{progress['episodes']}  "
+                f"steps {progress['steps']}  return {progress['return']:.1f}  "
+                f"max ΔQ {progress['max_delta_q']:.4f}"
+            )
+        )
+
+    def dismiss(self) -> bool:
+        self.__frame.pack_forget()
+        return True
+
+    def __cancel(self) -> None:
+        self.__cancel_button.config(state="disabled", text="Cancelling...")
+        self.__on_cancel()
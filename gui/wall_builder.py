@@ -1,9 +1,19 @@
+import base64
 import tkinter as tk
+import numpy as np
+from common.maze_format import POINTS, to_directions, save_maze, load_maze
 from .design_option import DesignOption
 
 VERTICAL, HORIZONTAL = 0, 1
 WALL_MODE, AREA_MODE = 0, 1
 
+MIN_CELL_SIZE = 10  # 칸 하나의 최소 픽셀 크기(이보다 작게 축소하지 않음, 전체 모습은 미니맵으로 확인)
+MAX_CELL_SIZE = 80  # 칸 하나의 최대 픽셀 크기
+ZOOM_STEP = 1.25  # 확대/축소 한 번의 배율
+BASE_CELL_SIZE = 40  # 디자인 옵션의 선 두께와 원 크기가 그대로 적용되는 칸 크기
+MINIMAP_SIZE = 150  # 미니맵 한 변의 최대 픽셀 크기
+MINIMAP_DELAY = 200  # 벽을 칠하는 동안 미니맵을 다시 만드는 최소 간격(ms)
+
 
 class WallBuilder:
     def __init__(
@@ -11,8 +21,8 @@ class WallBuilder:
         root: tk.Tk,  # 루트 TK 객체
         rows: int,  # 열 수
         cols: int,  # 행 수
-        width: int,  # 너비
-        height: int,  # 높이
+        width: int,  # 너비(보이는 영역)
+        height: int,  # 높이(보이는 영역)
         design_option: DesignOption = DesignOption(),
     ) -> "WallBuilder":
         self.__root = root
@@ -22,23 +32,85 @@ class WallBuilder:
         self.__height = height
         self.__design_option = design_option
 
-        # 캔버스 생성
-        self.__canvas = tk.Canvas(root, width=width, height=height)
-        self.__canvas.pack()
+        # 캔버스(스크롤바 포함)와 미니맵 생성
+        self.__frame = tk.Frame(root)
+        self.__frame.pack()
+        self.__canvas = tk.Canvas(self.__frame, width=width, height=height)
+        x_scrollbar = tk.Scrollbar(
+            self.__frame, orient=tk.HORIZONTAL, command=self.__on_xview
+        )
+        y_scrollbar = tk.Scrollbar(
+            self.__frame, orient=tk.VERTICAL, command=self.__on_yview
+        )
+        self.__canvas.config(
+            xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set
+        )
+        self.__minimap = tk.Canvas(self.__frame, width=MINIMAP_SIZE, height=MINIMAP_SIZE)
+
+        self.__canvas.grid(row=0, column=0)
+        y_scrollbar.grid(row=0, column=1, sticky="ns")
+        x_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.__minimap.grid(row=0, column=2, sticky="n", padx=10)
 
         # 초기 데이터 설정
         self.__markings: list["Marking"] = []  # 영역 표시
         self.__temp_marking: "Marking" = None  # 임시 영역 표시(클릭시 변경되는 영역)
-        self.__walls = {  # 벽 정보
-            VERTICAL: [
-                [(i == 0 or i == cols) for i in range(cols + 1)] for _ in range(rows)
-            ],
-            HORIZONTAL: [[(i == 0 or i == rows)] * cols for i in range(rows + 1)],
+        self.__loaded_points = dict.fromkeys(POINTS)  # 미로 파일에서 불러온 지점(지점 선택 페이지의 초기 선택)
+        self.__walls = {  # 벽 정보(가장자리는 항상 벽)
+            VERTICAL: np.zeros((rows, cols + 1), dtype=bool),
+            HORIZONTAL: np.zeros((rows + 1, cols), dtype=bool),
         }
+        self.__walls[VERTICAL][:, [0, -1]] = True
+        self.__walls[HORIZONTAL][[0, -1], :] = True
+
+        # 화면 배율: 칸 하나의 픽셀 크기(미로 바깥 여백도 한 칸)
+        self.__cell = int(
+            np.clip(
+                min(width // (cols + 2), height // (rows + 2)),
+                MIN_CELL_SIZE,
+                MAX_CELL_SIZE,
+            )
+        )
+
+        # 캔버스에는 보이는 영역 주변(화면 1/4장씩 여유)의 칸만 그림: (행 시작, 행 끝, 열 시작, 열 끝)
+        self.__drawn_range: tuple[int, int, int, int] = None
+
+        # 캔버스 항목 id(변경된 항목만 갱신하기 위해 보관, 그려진 영역의 항목만 있음)
+        self.__wall_items: dict[tuple[int, int, int], int] = {}  # (방향, 행, 열) -> id
+        self.__marking_items: list[int] = []  # 영역 표시별 id
+        self.__temp_marking_item: int = None  # 임시 영역 표시 id
+
+        # 드래그로 칠하는 중인 벽 정보와 다음 화면 갱신 때 반영할 벽
+        self.__paint_value: bool = None  # 드래그 중 벽에 칠할 값(벽 생성/제거)
+        self.__dirty_walls: set[tuple[int, int, int]] = set()  # (방향, 행, 열)
+        self.__flush_scheduled = False
+        self.__view_scheduled = False
+
+        # 미니맵 이미지(PhotoImage는 참조를 유지해야 화면에 남음)
+        self.__minimap_image: tk.PhotoImage = None
+        self.__minimap_scale = 1.0  # 미니맵 픽셀 / 칸
+        self.__minimap_scheduled = False  # 벽이 바뀌어 미니맵을 다시 만들 예약이 있는지
 
         # 클릭 이벤트 설정
         self.__click_event: int = WALL_MODE  # 이벤트 모드(벽 그리기, 영역 선택)
-        self.__canvas.bind("<Button-1>", self.__on_wall_click)
+        self.__bind_click_event()
+
+        # 확대/축소(Ctrl+휠, +/-), 이동(휠, Shift+휠, 가운데 버튼 끌기), 미니맵 클릭으로 이동
+        self.__canvas.bind("<Control-MouseWheel>", self.__on_zoom_wheel)
+        self.__canvas.bind("<Control-Button-4>", lambda event: self.zoom(ZOOM_STEP, event))
+        self.__canvas.bind("<Control-Button-5>", lambda event: self.zoom(1 / ZOOM_STEP, event))
+        self.__canvas.bind("<MouseWheel>", self.__on_scroll_wheel)
+        self.__canvas.bind("<Shift-MouseWheel>", self.__on_scroll_wheel)
+        self.__canvas.bind("<Button-4>", lambda event: self.__scroll(event, -1))
+        self.__canvas.bind("<Button-5>", lambda event: self.__scroll(event, 1))
+        self.__canvas.bind("<ButtonPress-2>", self.__on_pan_start)
+        self.__canvas.bind("<B2-Motion>", self.__on_pan)
+        self.__canvas.bind("<Enter>", lambda event: self.__canvas.focus_set())
+        self.__canvas.bind("<plus>", lambda event: self.zoom(ZOOM_STEP))
+        self.__canvas.bind("<equal>", lambda event: self.zoom(ZOOM_STEP))
+        self.__canvas.bind("<minus>", lambda event: self.zoom(1 / ZOOM_STEP))
+        self.__minimap.bind("<Button-1>", self.__on_minimap_click)
+        self.__minimap.bind("<B1-Motion>", self.__on_minimap_click)
 
         # 현재 상태를 그리기
         self.draw()
@@ -49,140 +121,443 @@ class WallBuilder:
             return self.__temp_marking.row, self.__temp_marking.col
         return None
 
-    # 현재 상태를 그리는 함수
+    @property
+    def loaded_points(self) -> dict[str, tuple[int, int]]:
+        return dict(self.__loaded_points)
+
+    # 이름(start, goal, end)을 붙여 표시한 지점, 아직 표시하지 않은 지점은 불러온 지점으로 채움
+    @property
+    def points(self) -> dict[str, tuple[int, int]]:
+        points = dict(self.__loaded_points)
+        for marking in self.__markings:
+            if marking.name is not None:
+                points[marking.name] = (marking.row, marking.col)
+        return points
+
+    # 현재 상태를 새로 그리는 함수(배율이 바뀌거나 미로를 불러왔을 때 사용)
     def draw(self) -> None:
-        self.__canvas.delete("all")
+        cell = self.__cell
+        self.__canvas.config(
+            scrollregion=(0, 0, (self.__cols + 2) * cell, (self.__rows + 2) * cell)
+        )
+        self.__drawn_range = None
+        self.__draw_viewport()
+        self.__draw_minimap()
 
-        # 수직 벽 그리기
-        for row in range(self.__rows):
-            for col in range(self.__cols + 1):
-                self.__draw_vertical_wall(row, col, self.__walls[VERTICAL][row][col])
+    # 미로 불러오기: 칸마다 이동 가능한 방향을 비트(1 << 행동)로 표시한 (세로, 가로) 배열
+    def load_mask(self, mask: np.ndarray) -> None:
+        mask = np.asarray(mask)
+        if mask.shape != (self.__rows, self.__cols):
+            raise ValueError(
+                f"maze shape {mask.shape} does not match {(self.__rows, self.__cols)}"
+            )
 
-        # 수평 벽 그리기
-        for row in range(self.__rows + 1):
-            for col in range(self.__cols):
-                self.__draw_horizontal_wall(
-                    row, col, self.__walls[HORIZONTAL][row][col]
-                )
+        # 칸 경계마다 양쪽 중 한 칸이라도 막혀 있으면 벽
+        blocked = [(mask & (1 << action)) == 0 for action in range(4)]
+        horizontal = np.zeros((self.__rows + 1, self.__cols), dtype=bool)
+        horizontal[:-1] |= blocked[0]
+        horizontal[1:] |= blocked[1]
+        vertical = np.zeros((self.__rows, self.__cols + 1), dtype=bool)
+        vertical[:, :-1] |= blocked[2]
+        vertical[:, 1:] |= blocked[3]
 
-        # 선택한 곳 그리기
-        if self.__temp_marking:
-            self.__draw_marking(self.__temp_marking)
+        self.__walls = {VERTICAL: vertical, HORIZONTAL: horizontal}
+        self.draw()
 
-        # 영역 표시
-        for marking in self.__markings:
-            self.__draw_marking(marking)
+    # 배율 변경(event가 있으면 마우스 위치를, 없으면 화면 가운데를 기준으로)
+    def zoom(self, factor: float, event=None) -> None:
+        cell = int(np.clip(round(self.__cell * factor), MIN_CELL_SIZE, MAX_CELL_SIZE))
+        if cell == self.__cell:
+            return
+
+        canvas = self.__canvas
+        x = event.x if event is not None else self.__width / 2
+        y = event.y if event is not None else self.__height / 2
+        world_x, world_y = canvas.canvasx(x) / self.__cell, canvas.canvasy(y) / self.__cell
+
+        self.__cell = cell
+        self.__canvas.config(
+            scrollregion=(0, 0, (self.__cols + 2) * cell, (self.__rows + 2) * cell)
+        )
+        self.__scroll_to(world_x * cell - x, world_y * cell - y)
+        self.draw()
 
     # 임시 영역 선택 초기화
     def reset_temp_marking(self) -> None:
         self.__temp_marking = None
-        self.draw()
+        if self.__temp_marking_item is not None:
+            self.__canvas.delete(self.__temp_marking_item)
+            self.__temp_marking_item = None
+        self.__draw_minimap_view()
 
-    # 영역 표시 추가
-    def add_marking(self, row: int, col: int, color: str) -> None:
-        self.__markings.append(Marking(row, col, color))
-        self.draw()
+    # 영역 표시 추가(name을 주면 저장할 때 그 지점으로 기록)
+    def add_marking(self, row: int, col: int, color: str, name: str = None) -> None:
+        marking = Marking(row, col, color, name)
+        self.__markings.append(marking)
+        self.__marking_items.append(self.__draw_marking(marking))
+        self.__draw_minimap_view()
 
     # 이벤트 모드(벽 그리기, 영역 선택)를 변경하는 함수
     def change_click_event(self) -> None:
         self.__canvas.unbind("<Button-1>")
+        self.__canvas.unbind("<B1-Motion>")
+        self.__canvas.unbind("<ButtonRelease-1>")
         if self.__click_event == WALL_MODE:
             self.__click_event = AREA_MODE
-            self.__canvas.bind("<Button-1>", self.__on_area_click)
         else:
             self.__click_event = WALL_MODE
+        self.__bind_click_event()
+
+    def __bind_click_event(self) -> None:
+        if self.__click_event == WALL_MODE:
+            # 클릭한 벽을 뒤집고, 누른 채 끌면 지나가는 벽을 같은 값으로 칠함
             self.__canvas.bind("<Button-1>", self.__on_wall_click)
+            self.__canvas.bind("<B1-Motion>", self.__on_wall_drag)
+            self.__canvas.bind("<ButtonRelease-1>", self.__on_wall_release)
+        else:
+            self.__canvas.bind("<Button-1>", self.__on_area_click)
 
     # MazeWorld에 필요한 벽 데이터를 추출하는 함수
     def get_movement_data(self) -> list[list[list[int]]]:
-        result = [[[] for _ in range(self.__cols)] for _ in range(self.__rows)]
+        return to_directions(self.get_mask())
+
+    # 칸마다 이동 가능한 방향을 비트(1 << 행동)로 표시한 (세로, 가로) uint8 배열
+    def get_mask(self) -> np.ndarray:
+        vertical, horizontal = self.__walls[VERTICAL], self.__walls[HORIZONTAL]
+        movable = (  # 위, 아래, 왼쪽, 오른쪽 벽 없음
+            ~horizontal[:-1],
+            ~horizontal[1:],
+            ~vertical[:, :-1],
+            ~vertical[:, 1:],
+        )
+        mask = np.zeros((self.__rows, self.__cols), dtype=np.uint8)
+        for action, open_side in enumerate(movable):
+            mask |= open_side.astype(np.uint8) << action
+        return mask
+
+    # 벽과 지금까지 정한(또는 불러온) 지점을 미로 파일로 저장
+    def save(self, path) -> None:
+        save_maze(path, self.get_mask(), **self.points)
+
+    # 미로 파일의 벽과 지점 불러오기
+    def load(self, path) -> None:
+        maze = load_maze(path)
+        self.load_mask(maze["mask"])
+        self.load_points(**{name: maze[name] for name in POINTS})
+
+    # 지점 선택 페이지에서 처음부터 선택해 둘 지점(미로 밖의 지점은 무시)
+    def load_points(self, start=None, goal=None, end=None) -> None:
+        for name, point in zip(POINTS, (start, goal, end)):
+            if point is not None and not (0 <= point[0] < self.__rows and 0 <= point[1] < self.__cols):
+                point = None
+            self.__loaded_points[name] = None if point is None else tuple(int(v) for v in point)
+
+    # 칸 하나를 임시 영역으로 선택(이미 표시한 칸이면 무시)
+    def select_area(self, row: int, col: int) -> None:
+        for marking in self.__markings:
+            if marking.row == row and marking.col == col:
+                return
+
+        self.reset_temp_marking()
+        self.__temp_marking = Marking(row, col, self.__design_option.disabled_color)
+        self.__temp_marking_item = self.__draw_marking(self.__temp_marking)
+        self.__draw_minimap_view()
+
+    # 보이는 영역(앞뒤로 화면 1/4장씩 여유)의 칸 범위
+    def __visible_range(self) -> tuple[int, int, int, int]:
+        canvas, cell = self.__canvas, self.__cell
+        left, top = canvas.canvasx(0), canvas.canvasy(0)
+        margin_x, margin_y = self.__width / 4, self.__height / 4
+
+        row_start = max(int((top - margin_y) / cell) - 1, 0)
+        row_end = min(int((top + self.__height + margin_y) / cell), self.__rows)
+        col_start = max(int((left - margin_x) / cell) - 1, 0)
+        col_end = min(int((left + self.__width + margin_x) / cell), self.__cols)
+        return row_start, row_end, col_start, col_end
+
+    # 화면 이동 후 그려 둔 영역을 벗어났을 때만 보이는 영역을 다시 그림
+    def __on_view_change(self) -> None:
+        self.__view_scheduled = False
+        self.__draw_minimap_view()
+
+        if self.__drawn_range is None:
+            return
+        canvas, cell = self.__canvas, self.__cell
+        row_start, row_end, col_start, col_end = self.__drawn_range
+        top, left = canvas.canvasy(0) / cell - 1, canvas.canvasx(0) / cell - 1
+        bottom = (canvas.canvasy(self.__height) / cell) - 1
+        right = (canvas.canvasx(self.__width) / cell) - 1
+        if (
+            (top < row_start and row_start > 0)
+            or (bottom > row_end and row_end < self.__rows)
+            or (left < col_start and col_start > 0)
+            or (right > col_end and col_end < self.__cols)
+        ):
+            self.__draw_viewport()
+
+    def __schedule_view_change(self) -> None:
+        if not self.__view_scheduled:
+            self.__view_scheduled = True
+            self.__root.after_idle(self.__on_view_change)
+
+    # 보이는 영역의 벽과 영역 표시만 그림
+    def __draw_viewport(self) -> None:
+        self.__canvas.delete("all")
+        self.__dirty_walls.clear()
+        self.__wall_items = {}
 
-        for row in range(self.__rows):
-            for col in range(self.__cols):
-                if not self.__walls[HORIZONTAL][row][col]:  # 위쪽 벽 없음
-                    result[row][col].append(0)
-                if not self.__walls[HORIZONTAL][row + 1][col]:
-                    result[row][col].append(1)
-                if not self.__walls[VERTICAL][row][col]:
-                    result[row][col].append(2)
-                if not self.__walls[VERTICAL][row][col + 1]:
-                    result[row][col].append(3)
+        row_start, row_end, col_start, col_end = self.__drawn_range = self.__visible_range()
 
-        return result
+        # 수직 벽 그리기
+        vertical = self.__walls[VERTICAL]
+        for row in range(row_start, row_end):
+            for col in range(col_start, min(col_end + 1, self.__cols + 1)):
+                self.__wall_items[VERTICAL, row, col] = self.__draw_vertical_wall(
+                    row, col, vertical[row, col]
+                )
+
+        # 수평 벽 그리기
+        horizontal = self.__walls[HORIZONTAL]
+        for row in range(row_start, min(row_end + 1, self.__rows + 1)):
+            for col in range(col_start, col_end):
+                self.__wall_items[HORIZONTAL, row, col] = self.__draw_horizontal_wall(
+                    row, col, horizontal[row, col]
+                )
+
+        # 선택한 곳 그리기
+        self.__temp_marking_item = None
+        if self.__temp_marking:
+            self.__temp_marking_item = self.__draw_marking(self.__temp_marking)
+
+        # 영역 표시
+        self.__marking_items = [self.__draw_marking(marking) for marking in self.__markings]
+
+    # 미니맵: 칸마다 벽이 많을수록 어둡게 표시한 축소 이미지와 보이는 영역 사각형
+    def __draw_minimap(self) -> None:
+        vertical, horizontal = self.__walls[VERTICAL], self.__walls[HORIZONTAL]
+        wall_count = (
+            horizontal[:-1].astype(np.uint8)
+            + horizontal[1:]
+            + vertical[:, :-1]
+            + vertical[:, 1:]
+        )
+
+        # 큰 미로는 여러 칸을 한 픽셀로 묶어 평균
+        block = int(np.ceil(max(self.__rows, self.__cols) / MINIMAP_SIZE))
+        rows, cols = -(-self.__rows // block), -(-self.__cols // block)
+        padded = np.zeros((rows * block, cols * block))
+        padded[: self.__rows, : self.__cols] = wall_count
+        shade = padded.reshape(rows, block, cols, block).mean(axis=(1, 3))
+
+        # 한 변이 MINIMAP_SIZE에 가깝도록 확대
+        zoom = max(MINIMAP_SIZE // max(rows, cols), 1)
+        pixels = (255 - shade * 48).astype(np.uint8).repeat(zoom, 0).repeat(zoom, 1)
+        self.__minimap_scale = zoom / block
+
+        header = f"P6 {pixels.shape[1]} {pixels.shape[0]} 255 ".encode()
+        data = header + np.repeat(pixels[:, :, None], 3, axis=2).tobytes()
+        self.__minimap_image = tk.PhotoImage(data=base64.b64encode(data), format="PPM")
+
+        self.__minimap.delete("all")
+        self.__minimap.create_image(0, 0, image=self.__minimap_image, anchor="nw")
+        self.__draw_minimap_view()
+
+    def __draw_minimap_view(self) -> None:
+        minimap, scale, cell = self.__minimap, self.__minimap_scale, self.__cell
+        minimap.delete("view")
+
+        for marking in self.__markings:
+            x, y = (marking.col + 0.5) * scale, (marking.row + 0.5) * scale
+            minimap.create_rectangle(
+                x - 2, y - 2, x + 2, y + 2, fill=marking.color, outline="", tags="view"
+            )
+
+        # 캔버스 좌표는 여백 한 칸을 포함하므로 칸 좌표로 바꿀 때 1을 뺌
+        canvas = self.__canvas
+        x1 = (canvas.canvasx(0) / cell - 1) * scale
+        y1 = (canvas.canvasy(0) / cell - 1) * scale
+        x2 = (canvas.canvasx(self.__width) / cell - 1) * scale
+        y2 = (canvas.canvasy(self.__height) / cell - 1) * scale
+        minimap.create_rectangle(
+            x1, y1, x2, y2, outline=self.__design_option.tertiary_color, tags="view"
+        )
+
+    # 화면 왼쪽 위를 캔버스 좌표 (x, y)로 이동
+    def __scroll_to(self, x: float, y: float) -> None:
+        width = (self.__cols + 2) * self.__cell
+        height = (self.__rows + 2) * self.__cell
+        self.__canvas.xview_moveto(max(x, 0) / width)
+        self.__canvas.yview_moveto(max(y, 0) / height)
+        self.__schedule_view_change()
+
+    def __on_xview(self, *args) -> None:
+        self.__canvas.xview(*args)
+        self.__schedule_view_change()
+
+    def __on_yview(self, *args) -> None:
+        self.__canvas.yview(*args)
+        self.__schedule_view_change()
+
+    def __scroll(self, event, units: int) -> None:
+        if event.state & 0x0001:  # Shift: 가로 이동
+            self.__canvas.xview_scroll(units, "units")
+        else:
+            self.__canvas.yview_scroll(units, "units")
+        self.__schedule_view_change()
+
+    def __on_scroll_wheel(self, event) -> None:
+        self.__scroll(event, -1 if event.delta > 0 else 1)
+
+    def __on_zoom_wheel(self, event) -> None:
+        self.zoom(ZOOM_STEP if event.delta > 0 else 1 / ZOOM_STEP, event)
+
+    def __on_pan_start(self, event) -> None:
+        self.__canvas.scan_mark(event.x, event.y)
+
+    def __on_pan(self, event) -> None:
+        self.__canvas.scan_dragto(event.x, event.y, gain=1)
+        self.__schedule_view_change()
+
+    def __on_minimap_click(self, event) -> None:  # 미니맵에서 누른 곳이 화면 가운데 오도록 이동
+        cell = self.__cell
+        col, row = event.x / self.__minimap_scale, event.y / self.__minimap_scale
+        self.__scroll_to(
+            (col + 1) * cell - self.__width / 2, (row + 1) * cell - self.__height / 2
+        )
+
+    # 배율에 맞춘 선 두께
+    def __line_width(self, enabled) -> int:
+        width = self.__design_option.get_border_width(not enabled)
+        return max(1, round(width * min(1, self.__cell / BASE_CELL_SIZE)))
 
     def __draw_vertical_wall(self, row, col, enabled):
-        x1 = x2 = (col + 1) * self.__width // (self.__cols + 2)
-        y1 = (row + 1) * self.__height // (self.__rows + 2)
-        y2 = (row + 2) * self.__height // (self.__rows + 2)
-        self.__canvas.create_line(
+        cell = self.__cell
+        x1 = x2 = (col + 1) * cell
+        y1 = (row + 1) * cell
+        y2 = (row + 2) * cell
+        return self.__canvas.create_line(
             x1,
             y1,
             x2,
             y2,
             fill=self.__design_option.get_primary_color(not enabled),
-            width=self.__design_option.get_border_width(not enabled),
+            width=self.__line_width(enabled),
         )
 
     def __draw_horizontal_wall(self, row, col, enabled):
-        x1 = (col + 1) * self.__width // (self.__cols + 2)
-        y1 = y2 = (row + 1) * self.__height // (self.__rows + 2)
-        x2 = (col + 2) * self.__width // (self.__cols + 2)
-        self.__canvas.create_line(
+        cell = self.__cell
+        x1 = (col + 1) * cell
+        y1 = y2 = (row + 1) * cell
+        x2 = (col + 2) * cell
+        return self.__canvas.create_line(
             x1,
             y1,
             x2,
             y2,
             fill=self.__design_option.get_primary_color(not enabled),
-            width=self.__design_option.get_border_width(not enabled),
+            width=self.__line_width(enabled),
         )
 
     def __draw_marking(self, marking):
-        x = (marking.col + 1.5) * self.__width // (self.__cols + 2)
-        y = (marking.row + 1.5) * self.__height // (self.__rows + 2)
-        self.__canvas.create_oval(
-            x - 10,
-            y - 10,
-            x + 10,
-            y + 10,
+        cell = self.__cell
+        x = (marking.col + 1.5) * cell
+        y = (marking.row + 1.5) * cell
+        radius = 10 * min(1, cell / BASE_CELL_SIZE)
+        return self.__canvas.create_oval(
+            x - radius,
+            y - radius,
+            x + radius,
+            y + radius,
             outline=marking.color,
-            width=self.__design_option.circle_width,
+            width=self.__line_width(True) if radius < 10 else self.__design_option.circle_width,
         )
 
-    def __on_wall_click(self, event):
-        x_offset = event.x * (self.__cols + 2) / self.__width
-        y_offset = event.y * (self.__rows + 2) / self.__height
+    # 클릭 위치를 칸 단위 좌표로 변환(여백 한 칸 포함)
+    def __cell_offset(self, event) -> tuple[float, float]:
+        return (
+            self.__canvas.canvasx(event.x) / self.__cell,
+            self.__canvas.canvasy(event.y) / self.__cell,
+        )
+
+    # 클릭 위치에 가장 가까운 내부 벽 (방향, 행, 열), 미로 밖이나 테두리면 None
+    def __find_wall(self, event) -> tuple[int, int, int]:
+        x_offset, y_offset = self.__cell_offset(event)
         x, y = round(x_offset), round(y_offset)
 
         if x <= 1 or x >= self.__cols + 1 or y <= 1 or y >= self.__rows + 1:
-            return
+            return None
 
         if abs(x - x_offset) < abs(y - y_offset):
-            direction = VERTICAL
-            x, y = x - 1, int(y_offset) - 1
-        else:
-            direction = HORIZONTAL
-            x, y = int(x_offset) - 1, y - 1
+            return VERTICAL, int(y_offset) - 1, x - 1
+        return HORIZONTAL, y - 1, int(x_offset) - 1
 
-        self.__walls[direction][y][x] = not self.__walls[direction][y][x]
-        self.draw()
+    # 벽 값을 바꾸고 다음 화면 갱신 때 한꺼번에 다시 그리도록 예약
+    def __set_wall(self, direction, row, col, enabled) -> None:
+        if self.__walls[direction][row, col] == enabled:
+            return
+        self.__walls[direction][row, col] = enabled
+        self.__dirty_walls.add((direction, row, col))
+
+        if not self.__flush_scheduled:
+            self.__flush_scheduled = True
+            self.__root.after_idle(self.__flush_walls)
+
+    # 바뀐 벽 선분의 색과 두께만 갱신
+    def __flush_walls(self) -> None:
+        self.__flush_scheduled = False
+        for wall in self.__dirty_walls:
+            if wall not in self.__wall_items:  # 그려진 영역 밖
+                continue
+            enabled = self.__walls[wall[0]][wall[1:]]
+            self.__canvas.itemconfigure(
+                self.__wall_items[wall],
+                fill=self.__design_option.get_primary_color(not enabled),
+                width=self.__line_width(enabled),
+            )
+        self.__dirty_walls.clear()
+
+        # 미니맵은 전체 칸을 다시 계산하므로 드래그 중에는 MINIMAP_DELAY마다 한 번만 다시 만듦
+        if not self.__minimap_scheduled:
+            self.__minimap_scheduled = True
+            self.__root.after(MINIMAP_DELAY, self.__flush_minimap)
+
+    def __flush_minimap(self) -> None:
+        self.__minimap_scheduled = False
+        self.__draw_minimap()
+
+    def __on_wall_click(self, event):
+        wall = self.__find_wall(event)
+        if wall is None:
+            self.__paint_value = None
+            return
+
+        direction, row, col = wall
+        self.__paint_value = not self.__walls[direction][row, col]
+        self.__set_wall(direction, row, col, self.__paint_value)
+
+    def __on_wall_drag(self, event):
+        if self.__paint_value is None:  # 미로 밖에서 시작한 드래그
+            return
+
+        wall = self.__find_wall(event)
+        if wall is not None:
+            self.__set_wall(*wall, self.__paint_value)
+
+    def __on_wall_release(self, event):
+        self.__paint_value = None
 
     def __on_area_click(self, event):
-        x_offset = event.x * (self.__cols + 2) / self.__width
-        y_offset = event.y * (self.__rows + 2) / self.__height
+        x_offset, y_offset = self.__cell_offset(event)
         x, y = int(x_offset) - 1, int(y_offset) - 1
 
         if x < 0 or x >= self.__cols or y < 0 or y >= self.__rows:
             return
-        for marking in self.__markings:
-            if marking.row == y and marking.col == x:
-                return
-
-        self.__temp_marking = Marking(y, x, self.__design_option.disabled_color)
-        self.draw()
+        self.select_area(y, x)
 
 
 class Marking:
-    def __init__(self, row: int, col: int, color: str) -> "Marking":
+    def __init__(self, row: int, col: int, color: str, name: str = None) -> "Marking":
         self.row = row
         self.col = col
         self.color = color
+        self.name = name  # 지점 이름(start, goal, end), 임시 표시는 None
@@ -1,31 +1,56 @@
+import numpy as np
 from gui.main_window import MainWindow
 from common.mazeworld import MazeWorld
+from common.trainer import ConvergenceMonitor, train
 from q_learning.q_learning import QLearningAgent
 
+EPISODES = 10000  # 최대 에피소드 수(그리디 정책이 PATIENCE 에피소드 동안 바뀌지 않으면 그 전에 멈춤)
+PATIENCE = 100
+MAX_STEPS_PER_CELL = 10  # 에피소드 최대 걸음 수 = 칸 수 * MAX_STEPS_PER_CELL
 
-def on_maze_made(data):
-    print("Start")
-
-    maze_world = MazeWorld(**data)
-    maze_agent = QLearningAgent()
-
-    episodes = 1000
-    for episode in range(episodes):
-        state = maze_world.reset()
-
-        while True:
-            action = maze_agent.get_action(state)
-            next_state, reward, done = maze_world.step(action)
 
-            maze_agent.update(state, action, reward, next_state, done)
-
-            if done:
-                break
-
-            state = next_state
+# MainWindow의 작업 스레드에서 실행되며, 에피소드마다 진행 상황을 report로 보냄
+def train_maze(data, report, cancel_event):
+    print("Start")
 
+    # 목표에 갈 수 없는 미로는 학습 전에 거부(오류 창으로 표시됨)
+    maze_world = MazeWorld(**data, require_solvable=True)
+    maze_world.max_steps = maze_world.state_size * MAX_STEPS_PER_CELL
+    maze_agent = QLearningAgent(maze_world.shape)
+    last_q = maze_agent.Q.table.copy()
+
+    def on_episode(episode, steps, total_reward):
+        max_delta_q = np.abs(maze_agent.Q.table - last_q).max()
+        last_q[...] = maze_agent.Q.table
+        report(
+            {
+                "episode": episode + 1,
+                "episodes": EPISODES,
+                "steps": steps,
+                "return": total_reward,
+                "max_delta_q": max_delta_q,
+            }
+        )
+        return cancel_event.is_set()
+
+    monitor = ConvergenceMonitor(maze_world, maze_agent, patience=PATIENCE)
+    train(maze_world, maze_agent, EPISODES, callback=on_episode, convergence=monitor)
+    if not cancel_event.is_set():
+        print(monitor.summary(EPISODES))
+    return maze_world, maze_agent
+
+
+# 창이 닫힌 뒤 메인 스레드에서 결과 시각화
+def on_trained(result):
+    maze_world, maze_agent = result
     maze_world.render_q(maze_agent.Q)
 
 
 if __name__ == "__main__":
-    MainWindow(title="Maze World", size=700, on_finish=on_maze_made).show()
+    MainWindow(
+        title="Maze World",
+        size=700,
+        on_train=train_maze,
+        train_episodes=EPISODES,
+        on_finish=on_trained,
+    ).show()
@@ -1,28 +1,22 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from collections import defaultdict
-import numpy as np
 from common.mazeworld import MazeWorld
-from common.utils import epsilon_greedy_probs
+from common.policy import GreedyPolicy
+from common.q_table import QTable
 
 
 class MCAgent:
-    def __init__(self):
+    def __init__(self, shape, seed=None):
         self.gamma = 0.9
         self.epsilon = 0.1
         self.alpha = 0.05
         self.action_size = 4
 
-        random_actions = {0: 0.25, 1:0.25, 2:0.25, 3:0.25}
-        self.pi = defaultdict(lambda: random_actions)
-        self.Q = defaultdict(lambda: 0)
+        self.pi = GreedyPolicy(shape, self.action_size, seed)  # epsilon-그리디로 사용
+        self.Q = QTable(shape, self.action_size)
         self.memory = []
 
     def get_action(self, state):
-        action_probs = self.pi[state]
-        actions = list(action_probs.keys())
-        probs = list(action_probs.values())
-        
-        return np.random.choice(actions, p=probs)
+        return self.pi.sample(state, self.epsilon)
     
     def add(self, state, action, reward):
         data = (state, action, reward)
@@ -39,28 +33,18 @@ class MCAgent:
             key = (state, action)
             
             self.Q[key] += (G - self.Q[key]) * self.alpha
-            self.pi[state] = epsilon_greedy_probs(self.Q, state, self.epsilon)
+            self.pi.update(state, self.Q.argmax(state))
 
 
 if __name__ == '__main__':
-    env = MazeWorld()
-    agent = MCAgent()
-
-    episodes = 1000
-    for episode in range(episodes):
-        state = env.reset()
-        agent.reset()
-
-        while True:
-            action = agent.get_action(state)
-            next_state, reward, done = env.step(action)
+    from common.trainer import ConvergenceMonitor, train
 
-            agent.add(state, action, reward)
-            
-            if done:
-                agent.update()
-                break
+    env = MazeWorld()
+    agent = MCAgent(env.shape)
 
-            state = next_state
+    episodes = 1000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, patience=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
 
     env.render_q(agent.Q)
\ No newline at end of file
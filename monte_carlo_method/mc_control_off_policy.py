@@ -1,29 +1,23 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from collections import defaultdict
-import numpy as np
 from common.mazeworld import MazeWorld
-from common.utils import epsilon_greedy_probs
+from common.policy import GreedyPolicy
+from common.q_table import QTable
 
 
 class MCOFFPolicyAgent:
-    def __init__(self):
+    def __init__(self, shape, seed=None):
         self.gamma = 0.9
         self.epsilon = 0.05
         self.alpha = 0.2
         self.action_size = 4
 
-        random_actions = {0: 0.25, 1:0.25, 2:0.25, 3:0.25}
-        self.pi = defaultdict(lambda: random_actions)
-        self.b = defaultdict(lambda: random_actions)
-        self.Q = defaultdict(lambda: 0)
+        # 목표 정책 pi는 그리디, 행동 정책 b는 같은 그리디 행동에 epsilon을 적용한 것
+        self.pi = GreedyPolicy(shape, self.action_size, seed)
+        self.Q = QTable(shape, self.action_size)
         self.memory = []
 
     def get_action(self, state):
-        action_probs = self.b[state]
-        actions = list(action_probs.keys())
-        probs = list(action_probs.values())
-        
-        return np.random.choice(actions, p=probs)
+        return self.pi.sample(state, self.epsilon)
     
     def add(self, state, action, reward):
         data = (state, action, reward)
@@ -42,32 +36,20 @@ class MCOFFPolicyAgent:
 
             G = self.gamma * rho * G + reward
             self.Q[key] += (G - self.Q[key]) * self.alpha
-            rho *= self.pi[state][action] / self.b[state][action]
+            rho *= self.pi.prob(state, action) / self.pi.prob(state, action, self.epsilon)
             
-            self.pi[state] = epsilon_greedy_probs(self.Q, state, epsilon=0)
-            self.b[state] = epsilon_greedy_probs(self.Q, state, self.epsilon)
+            self.pi.update(state, self.Q.argmax(state))
 
 
 if __name__ == '__main__':
-    env = MazeWorld()
-    agent = MCOFFPolicyAgent()
-
-    episodes = 100
-    for episode in range(episodes):
-        print(episode)
-        state = env.reset()
-        agent.reset()
-
-        while True:
-            action = agent.get_action(state)
-            next_state, reward, done = env.step(action)
+    from common.trainer import ConvergenceMonitor, train
 
-            agent.add(state, action, reward)
-            
-            if done:
-                agent.update()
-                break
+    env = MazeWorld()
+    agent = MCOFFPolicyAgent(env.shape)
 
-            state = next_state
+    episodes = 100  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, patience=50)
+    train(env, agent, episodes, convergence=monitor, callback=lambda episode, steps, total_reward: print(episode))
+    print(monitor.summary(episodes))
 
     env.render_q(agent.Q)
\ No newline at end of file
@@ -0,0 +1,122 @@
+import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import heapq
+import numpy as np
+from common.mazeworld import MazeWorld
+try:
+    from q_learning.q_learning import QLearningAgent
+except ModuleNotFoundError:  # 이 파일을 직접 실행하면 같은 폴더의 q_learning.py가 패키지 이름을 가림
+    from q_learning import QLearningAgent
+
+class DynaQAgent(QLearningAgent):
+    def __init__(self, shape, planning_steps=10, prioritized=False, seed=None):
+        super().__init__(shape, seed=seed)
+        self.planning_steps = planning_steps  # 실제 한 스텝마다 모델로 하는 가상 갱신 횟수
+        self.prioritized = prioritized  # 가치 변화가 큰 (상태, 행동)부터 갱신(prioritized sweeping)
+        self.theta = 1e-4  # 우선순위 큐에 넣을 최소 변화량
+
+        # 가상 갱신할 (상태, 행동)을 뽑는 난수(체크포인트에 상태가 저장됨, 시드가 없으면 전역 np.random에서 뽑음)
+        self.rng = np.random.default_rng(np.random.randint(2**31) if seed is None else seed + 2)
+
+        # 관찰한 전이의 모델: 미로는 결정론적이므로 (상태, 행동)마다 마지막 결과만 저장
+        self.width = shape[1]
+        state_size = shape[0] * shape[1]
+        self.model_next = np.full((state_size, self.action_size), -1, dtype=np.int64)
+        self.model_reward = np.zeros((state_size, self.action_size))
+        self.model_done = np.zeros((state_size, self.action_size), dtype=bool)
+        self.observed = []  # 관찰한 (상태 번호 * 행동 개수 + 행동) 목록(무작위 선택용)
+        self.observed_at = np.full((state_size, self.action_size), -1, dtype=np.int64)  # observed에서의 위치(-1이면 미관찰)
+        self.predecessors = [[] for _ in range(state_size)]  # 다음 상태 -> 그곳으로 가는 (상태, 행동)
+        self.queue = []  # (-우선순위, 상태, 행동)
+        self.queued = np.zeros((state_size, self.action_size))  # 큐에 들어 있는 최신 우선순위(0이면 없음)
+
+    def get_action(self, state):
+        # 가상 갱신은 방문하지 않은 상태의 Q도 바꾸므로 행동을 고르기 전에 그리디 행동을 현재 Q에 맞춤
+        self.pi.update(state, self.Q.argmax(state))
+        return self.pi.sample(state, self.epsilon)
+
+    def update(self, state, action, reward, next_state, done):
+        if not self.observed and (self.model_next >= 0).any():  # 체크포인트에서 모델 배열과 queued만 복원된 경우
+            self.rebuild_index()
+
+        s = state[0] * self.width + state[1]
+        next_s = next_state[0] * self.width + next_state[1]
+        if self.model_next[s, action] < 0:
+            self.observed_at[s, action] = len(self.observed)
+            self.observed.append(s * self.action_size + action)
+            self.predecessors[next_s].append((s, action))
+        self.model_next[s, action] = next_s
+        self.model_reward[s, action] = reward
+        self.model_done[s, action] = done
+
+        if self.prioritized:
+            priority = abs(self.target(self.Q.flat, s, action) - self.Q.flat[s, action])
+            super().update(state, action, reward, next_state, done)
+            self.push(s, action, priority)
+            self.sweep()
+        else:
+            super().update(state, action, reward, next_state, done)
+            self.plan()
+
+    def rebuild_index(self):  # 모델 배열로부터 관찰 목록과 앞 상태 목록을, queued로부터 우선순위 큐를 다시 만듦
+        # 무작위 선택 결과가 같도록 관찰한 순서대로 다시 만듦
+        observed = np.argsort(self.observed_at, axis=None, kind="stable")[np.sort(self.observed_at, axis=None) >= 0]
+        states, actions = np.divmod(observed, self.action_size)
+        self.observed = observed.tolist()
+        self.predecessors = [[] for _ in range(len(self.model_next))]
+        for s, action in zip(states.tolist(), actions.tolist()):
+            self.predecessors[self.model_next[s, action]].append((s, action))
+
+        # 큐에서 꺼낼 때 유효한 항목은 queued와 우선순위가 같은 항목뿐이므로 그것만 다시 넣으면 꺼내는 순서가 같음
+        states, actions = np.nonzero(self.queued)
+        self.queue = [(-self.queued[s, action], s, action) for s, action in zip(states.tolist(), actions.tolist())]
+        heapq.heapify(self.queue)
+
+    def target(self, Q, s, action):  # 모델로 계산한 Q 학습 목표값
+        if self.model_done[s, action]:
+            return self.model_reward[s, action]
+        return self.model_reward[s, action] + self.gamma * Q[self.model_next[s, action]].max()
+
+    def plan(self):  # 관찰한 (상태, 행동)을 무작위로 골라 갱신
+        Q = self.Q.flat
+        samples = self.rng.integers(len(self.observed), size=self.planning_steps)
+        for sample in samples.tolist():
+            s, action = divmod(self.observed[sample], self.action_size)
+            Q[s, action] += (self.target(Q, s, action) - Q[s, action]) * self.alpha
+
+    def push(self, s, action, priority):  # 이미 더 높은 우선순위로 들어 있으면 넣지 않음
+        if priority > self.theta and priority > self.queued[s, action]:
+            self.queued[s, action] = priority
+            heapq.heappush(self.queue, (-priority, s, action))
+
+    def sweep(self):  # 우선순위가 높은 (상태, 행동)부터 갱신하고 그 앞 상태들의 우선순위 계산
+        Q = self.Q.flat
+        updates = 0
+        while self.queue and updates < self.planning_steps:
+            priority, s, action = heapq.heappop(self.queue)
+            if -priority != self.queued[s, action]:  # 더 높은 우선순위로 다시 들어간 항목
+                continue
+            self.queued[s, action] = 0
+            Q[s, action] += (self.target(Q, s, action) - Q[s, action]) * self.alpha
+            updates += 1
+
+            for prev_s, prev_action in self.predecessors[s]:
+                self.push(prev_s, prev_action, abs(self.target(Q, prev_s, prev_action) - Q[prev_s, prev_action]))
+
+
+if __name__ == '__main__':
+    import time
+    from common.maze_generator import generate_maze
+    from common.trainer import train
+
+    env = MazeWorld(**generate_maze(20, 20, braid_factor=0.2, seed=0))
+    for name, agent in (
+        ("Q-learning", QLearningAgent(env.shape)),
+        ("Dyna-Q", DynaQAgent(env.shape)),
+        ("Dyna-Q (prioritized)", DynaQAgent(env.shape, prioritized=True)),
+    ):
+        start_time = time.time()
+        history = train(env, agent, 100)
+        steps = [steps for steps, _ in history]
+        print(f"{name}: last 10 episodes {np.mean(steps[-10:]):.1f} steps, {time.time() - start_time:.2f}s")
+
+    env.render_q(agent.Q)
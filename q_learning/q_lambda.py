@@ -0,0 +1,59 @@
+import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from common.mazeworld import MazeWorld
+from common.eligibility import EligibilityTraces
+from common.policy import GreedyPolicy
+from common.q_table import QTable
+
+class QLambdaAgent:
+    # Watkins Q(λ): Q 학습의 TD 오차를 적격 흔적으로 지나온 (상태, 행동)에 나눠 반영하되,
+    # 그리디가 아닌(탐험) 행동을 하면 그 이전 흔적은 목표 정책의 경로가 아니므로 모두 지움
+    runner = "q"  # update(s, a, r, s', done)로 학습(reset이 있어도 trainer가 SARSA로 진행하지 않도록 명시)
+
+    def __init__(self, shape, seed=None, replacing=True):
+        self.gamma = 0.9
+        self.alpha = 0.5
+        self.lamda = 0.9
+        self.epsilon = 0.1
+        self.action_size = 4
+
+        self.pi = GreedyPolicy(shape, self.action_size, seed)
+        self.Q = QTable(shape, self.action_size)
+
+        # 흔적 번호는 상태 번호 * 행동 개수 + 행동(Q.table을 1차원으로 본 번호)
+        self.width = shape[1]
+        self.traces = EligibilityTraces(shape[0] * shape[1] * self.action_size, replacing)
+
+    def reset(self):  # 에피소드 시작(잘린 에피소드 다음 포함)마다 흔적 제거
+        self.traces.clear()
+
+    def get_action(self, state):
+        # 흔적으로 지나온 상태들의 Q가 함께 바뀌므로 행동을 고르기 전에 그 상태의 그리디 행동을 현재 Q에 맞춤
+        self.pi.update(state, self.Q.argmax(state))
+        return self.pi.sample(state, self.epsilon)
+
+    def update(self, state, action, reward, next_state, done):
+        s = state[0] * self.width + state[1]
+        Q = self.Q.flat
+
+        if Q[s, action] < Q[s].max():  # 탐험 행동
+            self.traces.clear()
+
+        next_q_max = 0 if done else Q[next_state[0] * self.width + next_state[1]].max()
+        td_error = reward + self.gamma * next_q_max - Q[s, action]
+
+        self.traces.visit(s * self.action_size + action)
+        self.traces.apply(self.Q.table.reshape(-1), self.alpha * td_error, self.gamma * self.lamda)
+
+
+if __name__ == '__main__':
+    from common.trainer import ConvergenceMonitor, train
+
+    env = MazeWorld()
+    agent = QLambdaAgent(env.shape)
+
+    episodes = 1000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, patience=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
+
+    env.render_q(agent.Q)
\ No newline at end of file
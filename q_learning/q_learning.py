@@ -1,59 +1,82 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from collections import defaultdict
 import numpy as np
 from common.mazeworld import MazeWorld
-from common.utils import epsilon_greedy_probs
+from common.policy import GreedyPolicy
+from common.q_table import QTable
+from common.replay_buffer import ReplayBuffer
 
 class QLearningAgent:
-    def __init__(self):
+    def __init__(self, shape, replay_capacity=None, batch_size=32, replay_every=4, seed=None, initial_q=None):
         self.gamma = 0.9
         self.alpha = 0.8
         self.epsilon = 0.1
         self.action_size = 4
 
-        random_actions = {0: 0.25, 1: 0.25, 2: 0.25, 3: 0.25}
-        self.pi = defaultdict(lambda: random_actions)
-        self.b = defaultdict(lambda: random_actions)
-        self.Q = defaultdict(lambda: 0)
+        # 목표 정책 pi는 Q의 그리디 정책, 행동 정책 b는 같은 그리디 행동에 epsilon을 적용한 것
+        self.pi = GreedyPolicy(shape, self.action_size, seed)
+        self.Q = QTable(shape, self.action_size)
+        if initial_q is not None:  # 초기 Q 배열(shortest_path.heuristic_q 등), 복사해서 사용
+            self.Q.table[...] = initial_q
+            self.pi.greedy[:] = self.Q.flat.argmax(axis=1)
 
-    def get_action(self, state):
-        action_probs = self.b[state]
-        actions = list(action_probs.keys())
-        probs = list(action_probs.values())
+        # replay_capacity를 주면 전이를 저장해 두고 replay_every 스텝마다 미니배치로 한 번 더 갱신(경험 재생)
+        self.width = shape[1]
+        self.batch_size = batch_size
+        self.replay_every = replay_every
+        self.replay_steps = 0  # 저장한 전이 수(replay_every마다 미니배치 갱신)
+        self.replay = None
+        if replay_capacity is not None:
+            self.replay = ReplayBuffer(replay_capacity, None if seed is None else seed + 1)
 
-        return np.random.choice(actions, p=probs)
+    def get_action(self, state):
+        return self.pi.sample(state, self.epsilon)
     
     def update(self, state, action, reward, next_state, done):
         if done:
             next_q_max = 0
         else:
-            next_qs = [self.Q[next_state, a] for a in range(self.action_size)]
-            next_q_max = max(next_qs)
+            next_q_max = self.Q.max(next_state)
         
         target = reward + self.gamma * next_q_max
         self.Q[state, action] += (target - self.Q[state, action]) * self.alpha
 
-        self.pi[state] = epsilon_greedy_probs(self.Q, state, epsilon=0)
-        self.b[state] = epsilon_greedy_probs(self.Q, state, epsilon=self.epsilon)
+        self.pi.update(state, self.Q.argmax(state))
 
+        if self.replay is not None:
+            self.replay.add(
+                state[0] * self.width + state[1], action, reward,
+                next_state[0] * self.width + next_state[1], done)
+            self.replay_steps += 1
+            if len(self.replay) >= self.batch_size and self.replay_steps % self.replay_every == 0:
+                self.replay_update()
 
-if __name__ == '__main__':
-    env = MazeWorld()
-    agent = QLearningAgent()
+    def replay_update(self):  # 저장한 전이의 미니배치로 Q를 한 번에 갱신
+        states, actions, rewards, next_states, dones = self.replay.sample(self.batch_size)
+        Q = self.Q.flat
 
-    episodes = 1000
-    for episode in range(episodes):
-        state = env.reset()
+        next_q_max = np.where(dones, 0, Q[next_states].max(axis=1))
+        target = rewards + self.gamma * next_q_max
+        td_error = (target - Q[states, actions]) * self.alpha
 
-        while True:
-            action = agent.get_action(state)
-            next_state, reward, done = env.step(action)
+        # 같은 (상태, 행동)이 여러 번 뽑히면 평균만큼만 갱신
+        keys, inverse, counts = np.unique(
+            states * self.action_size + actions, return_inverse=True, return_counts=True)
+        Q.reshape(-1)[keys] += np.bincount(inverse, td_error) / counts
 
-            agent.update(state, action, reward, next_state, done)
+        # 갱신된 상태의 그리디 행동도 Q에 맞춤(같은 상태가 여러 번 있어도 같은 값을 씀)
+        updated = keys // self.action_size
+        self.pi.greedy[updated] = Q[updated].argmax(axis=1)
 
-            if done:
-                break
 
-            state = next_state
+if __name__ == '__main__':
+    from common.trainer import ConvergenceMonitor, train
+
+    env = MazeWorld()
+    agent = QLearningAgent(env.shape)
+
+    episodes = 1000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, patience=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
 
     env.render_q(agent.Q)
\ No newline at end of file
@@ -1,30 +1,28 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from collections import defaultdict
 import numpy as np
 from common.mazeworld import MazeWorld
+from common.q_table import QTable
 
 class QLearningAgent:
-    def __init__(self):
+    def __init__(self, shape):
         self.gamma = 0.9
         self.alpha = 0.8
         self.epsilon = 0.1
         self.action_size = 4
 
-        self.Q = defaultdict(lambda: 0)
+        self.Q = QTable(shape, self.action_size)
 
     def get_action(self, state):
         if np.random.rand() < self.epsilon:
             return np.random.choice(self.action_size)
         else:
-            qs = [self.Q[state, a] for a in range(self.action_size)]
-            return np.argmax(qs)
+            return self.Q.argmax(state)
     
     def update(self, state, action, reward, next_state, done):
         if done:
             next_q_max = 0
         else:
-            next_qs = [self.Q[next_state, a] for a in range(self.action_size)]
-            next_q_max = max(next_qs)
+            next_q_max = self.Q.max(next_state)
         
         target = reward + self.gamma * next_q_max
         self.Q[state, action] += (target - self.Q[state, action]) * self.alpha
@@ -32,7 +30,7 @@ class QLearningAgent:
 
 if __name__ == '__main__':
     env = MazeWorld()
-    agent = QLearningAgent()
+    agent = QLearningAgent(env.shape)
 
     episodes = 1000
     for episode in range(episodes):
@@ -1,27 +1,25 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from collections import defaultdict, deque
-import numpy as np
+from collections import deque
 from common.mazeworld import MazeWorld
-from common.utils import epsilon_greedy_probs
+from common.policy import GreedyPolicy
+from common.q_table import QTable
 
 class SARSAAgent:
-    def __init__(self):
+    def __init__(self, shape, seed=None, initial_q=None):
         self.gamma = 0.9
         self.alpha = 0.8
         self.epsilon = 0.1
         self.action_size = 4
 
-        random_actions = {0: 0.25, 1: 0.25, 2: 0.25, 3:0.25}
-        self.pi = defaultdict(lambda: random_actions)
-        self.Q = defaultdict(lambda: 0)
+        self.pi = GreedyPolicy(shape, self.action_size, seed)  # epsilon-그리디로 사용
+        self.Q = QTable(shape, self.action_size)
+        if initial_q is not None:  # 초기 Q 배열(shortest_path.heuristic_q 등), 복사해서 사용
+            self.Q.table[...] = initial_q
+            self.pi.greedy[:] = self.Q.flat.argmax(axis=1)
         self.memory = deque(maxlen=2)
 
     def get_action(self, state):
-        action_probs = self.pi[state]
-        actions = list(action_probs.keys())
-        probs = list(action_probs.values())
-        
-        return np.random.choice(actions, p=probs)
+        return self.pi.sample(state, self.epsilon)
     
     def reset(self):
         self.memory.clear()
@@ -38,28 +36,18 @@ class SARSAAgent:
         target = reward + self.gamma * next_q
         self.Q[state, action] += (target - self.Q[state, action]) * self.alpha
 
-        self.pi[state] = epsilon_greedy_probs(self.Q, state, self.epsilon)
+        self.pi.update(state, self.Q.argmax(state))
 
 
 if __name__ == '__main__':
-    env = MazeWorld()
-    agent = SARSAAgent()
-
-    episodes = 1000
-    for episode in range(episodes):
-        state = env.reset()
-        agent.reset()
+    from common.trainer import ConvergenceMonitor, train
 
-        while True:
-            action = agent.get_action(state)
-            next_state, reward, done = env.step(action)
-
-            agent.update(state, action, reward, done)
-
-            if done:
-                agent.update(next_state, None, None, None)
-                break
+    env = MazeWorld()
+    agent = SARSAAgent(env.shape)
 
-            state = next_state
+    episodes = 1000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, patience=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
 
     env.render_q(agent.Q)
\ No newline at end of file
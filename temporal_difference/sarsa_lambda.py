@@ -0,0 +1,62 @@
+import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from collections import deque
+from common.mazeworld import MazeWorld
+from common.eligibility import EligibilityTraces
+from common.policy import GreedyPolicy
+from common.q_table import QTable
+
+class SARSALambdaAgent:
+    # SARSA의 TD 오차를 (상태, 행동) 적격 흔적에 따라 최근에 지나온 모든 (상태, 행동)에 나눠 반영하는 SARSA(λ)
+    def __init__(self, shape, seed=None, replacing=True, initial_q=None):
+        self.gamma = 0.9
+        self.alpha = 0.5
+        self.lamda = 0.9
+        self.epsilon = 0.1
+        self.action_size = 4
+
+        self.pi = GreedyPolicy(shape, self.action_size, seed)  # epsilon-그리디로 사용
+        self.Q = QTable(shape, self.action_size)
+        if initial_q is not None:  # 초기 Q 배열(shortest_path.heuristic_q 등), 복사해서 사용
+            self.Q.table[...] = initial_q
+        self.memory = deque(maxlen=2)
+
+        # 흔적 번호는 상태 번호 * 행동 개수 + 행동(Q.table을 1차원으로 본 번호)
+        self.width = shape[1]
+        self.traces = EligibilityTraces(shape[0] * shape[1] * self.action_size, replacing)
+
+    def get_action(self, state):
+        # 흔적으로 지나온 상태들의 Q가 함께 바뀌므로 행동을 고르기 전에 그 상태의 그리디 행동을 현재 Q에 맞춤
+        self.pi.update(state, self.Q.argmax(state))
+        return self.pi.sample(state, self.epsilon)
+    
+    def reset(self):
+        self.memory.clear()
+        self.traces.clear()
+
+    def update(self, state, action, reward, done):
+        self.memory.append((state, action, reward, done))
+        if len(self.memory) < 2:
+            return
+        
+        state, action, reward, done = self.memory[0]
+        next_state, next_action, _, _ = self.memory[1]
+        next_q = 0 if done else self.Q[next_state, next_action]
+        td_error = reward + self.gamma * next_q - self.Q[state, action]
+
+        s = state[0] * self.width + state[1]
+        self.traces.visit(s * self.action_size + action)
+        self.traces.apply(self.Q.table.reshape(-1), self.alpha * td_error, self.gamma * self.lamda)
+
+
+if __name__ == '__main__':
+    from common.trainer import ConvergenceMonitor, train
+
+    env = MazeWorld()
+    agent = SARSALambdaAgent(env.shape)
+
+    episodes = 1000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, patience=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
+
+    env.render_q(agent.Q)
\ No newline at end of file
@@ -1,28 +1,23 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from collections import defaultdict, deque
-import numpy as np
+from collections import deque
 from common.mazeworld import MazeWorld
-from common.utils import epsilon_greedy_probs
+from common.policy import GreedyPolicy
+from common.q_table import QTable
 
 class SARSAOffPolicyAgent:
-    def __init__(self):
+    def __init__(self, shape, seed=None):
         self.gamma = 0.9
         self.alpha = 0.8
         self.epsilon = 0.1
         self.action_size = 4
 
-        random_actions = {0: 0.25, 1: 0.25, 2: 0.25, 3:0.25}
-        self.pi = defaultdict(lambda: random_actions)
-        self.b = defaultdict(lambda: random_actions)
-        self.Q = defaultdict(lambda: 0)
+        # 목표 정책 pi는 그리디, 행동 정책 b는 같은 그리디 행동에 epsilon을 적용한 것
+        self.pi = GreedyPolicy(shape, self.action_size, seed)
+        self.Q = QTable(shape, self.action_size)
         self.memory = deque(maxlen=2)
 
     def get_action(self, state):
-        action_probs = self.b[state]
-        actions = list(action_probs.keys())
-        probs = list(action_probs.values())
-        
-        return np.random.choice(actions, p=probs)
+        return self.pi.sample(state, self.epsilon)
     
     def reset(self):
         self.memory.clear()
@@ -42,34 +37,23 @@ class SARSAOffPolicyAgent:
             rho = 1
         else:
             next_q = self.Q[next_state, next_action]
-            rho *= self.pi[next_state][next_action] / self.b[next_state][next_action]
+            rho *= self.pi.prob(next_state, next_action) / self.pi.prob(next_state, next_action, self.epsilon)
 
         target = rho * (reward + self.gamma * next_q)
         self.Q[state, action] += (target - self.Q[state, action]) * self.alpha
 
-        self.pi[state] = epsilon_greedy_probs(self.Q, state, 0)
-        self.b[state] = epsilon_greedy_probs(self.Q, state, self.epsilon)
+        self.pi.update(state, self.Q.argmax(state))
 
 
 if __name__ == '__main__':
-    env = MazeWorld()
-    agent = SARSAOffPolicyAgent()
-
-    episodes = 1000
-    for episode in range(episodes):
-        state = env.reset()
-        agent.reset()
+    from common.trainer import ConvergenceMonitor, train
 
-        while True:
-            action = agent.get_action(state)
-            next_state, reward, done = env.step(action)
-
-            agent.update(state, action, reward, done)
-
-            if done:
-                agent.update(next_state, None, None, None)
-                break
+    env = MazeWorld()
+    agent = SARSAOffPolicyAgent(env.shape)
 
-            state = next_state
+    episodes = 1000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, patience=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
 
     env.render_q(agent.Q)
\ No newline at end of file
@@ -1,24 +1,19 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from collections import defaultdict
-import numpy as np
 from common.mazeworld import MazeWorld
+from common.policy import GreedyPolicy
 
 class TDAgent:
-    def __init__(self):
+    def __init__(self, shape, seed=None):
         self.gamma = 0.9
         self.alpha = 0.01
         self.action_size = 4
 
-        random_actions = {0: 0.25, 1: 0.25, 2: 0.25, 3:0.25}
-        self.pi = defaultdict(lambda: random_actions)
+        self.pi = GreedyPolicy(shape, self.action_size, seed)  # 그리디 행동을 정하지 않으므로 무작위 정책
         self.V = defaultdict(lambda: 0)
 
     def get_action(self, state):
-        action_probs = self.pi[state]
-        actions = list(action_probs.keys())
-        probs = list(action_probs.values())
-        
-        return np.random.choice(actions, p=probs)
+        return self.pi.sample(state)
     
     def eval(self, state, reward, next_state, done):
         next_V = 0 if done else self.V[next_state]
@@ -27,20 +22,14 @@ class TDAgent:
 
 
 if __name__ == '__main__':
-    env = MazeWorld()
-    agent = TDAgent()
-
-    episodes = 1000
-    for episode in range(episodes):
-        state = env.reset()
+    from common.trainer import ConvergenceMonitor, train
 
-        while True:
-            action = agent.get_action(state)
-            next_state, reward, done = env.step(action)
+    env = MazeWorld()
+    agent = TDAgent(env.shape)
 
-            agent.eval(state, reward, next_state, done)
-            if done:
-                break
-            state = next_state
+    episodes = 1000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, tolerance=0.05, window=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
 
     env.render_v(agent.V)
\ No newline at end of file
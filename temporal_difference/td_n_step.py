@@ -1,67 +1,48 @@
 import os, sys; sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from collections import defaultdict, deque
 import numpy as np
 from common.mazeworld import MazeWorld
+from common.eligibility import EligibilityTraces
+from common.policy import GreedyPolicy
 
 class TDNStepAgent:
-    def __init__(self):
+    # λ-수익(모든 n-스텝 수익의 가중 평균)을 목표로 하는 TD(λ)를 적격 흔적으로 계산하는 후방 관점 구현
+    # (지난 보상과 n-스텝 수익을 매 스텝 다시 합하지 않으므로 스텝당 비용이 에피소드 길이와 무관)
+    def __init__(self, shape, seed=None, replacing=False):
         self.gamma = 0.9
         self.alpha = 0.01
         self.lamda = 0.9
         self.action_size = 4
 
-        random_actions = {0: 0.25, 1: 0.25, 2: 0.25, 3:0.25}
-        self.pi = defaultdict(lambda: random_actions)
-        self.V = defaultdict(lambda: 0)
-        self.memory_R = []
-        self.memory_G = []
+        self.pi = GreedyPolicy(shape, self.action_size, seed)  # 그리디 행동을 정하지 않으므로 무작위 정책
+        self.V = np.zeros(shape)
+        self.width = shape[1]
+        self.traces = EligibilityTraces(shape[0] * shape[1], replacing)
 
     def get_action(self, state):
-        action_probs = self.pi[state]
-        actions = list(action_probs.keys())
-        probs = list(action_probs.values())
-        
-        return np.random.choice(actions, p=probs)
+        return self.pi.sample(state)
     
     def reset(self):
-        self.memory_R.clear()
-        self.memory_G.clear()
+        self.traces.clear()
     
     def eval_nstep(self, state, reward, next_state, done):
-        self.memory_R.append(reward)
+        V = self.V.reshape(-1)
+        s = state[0] * self.width + state[1]
+        next_V = 0 if done else V[next_state[0] * self.width + next_state[1]]
+        td_error = reward + self.gamma * next_V - V[s]
 
-        next_V = 0 if done else self.V[next_state]
-        G_n = next_V
-        for r in reversed(self.memory_R):
-           G_n *= self.gamma
-           G_n += r
-        
-        self.memory_G.append(G_n)
-        target = 0
-        for g in reversed(self.memory_G):
-            target *= self.lamda
-            target += g
-        target *= (1 - self.lamda)
-
-        self.V[state] += (target - self.V[state]) * self.alpha
+        self.traces.visit(s)
+        self.traces.apply(V, self.alpha * td_error, self.gamma * self.lamda)
 
 
 if __name__ == '__main__':
-    env = MazeWorld()
-    agent = TDNStepAgent()
+    from common.trainer import ConvergenceMonitor, train
 
-    episodes = 5000
-    for episode in range(episodes):
-        state = env.reset()
-        agent.reset()
-
-        while True:
-            action = agent.get_action(state)
-            next_state, reward, done = env.step(action)
+    env = MazeWorld()
+    agent = TDNStepAgent(env.shape)
 
-            agent.eval_nstep(state, reward, next_state, done)
-            if done:
-                break
-            state = next_state
+    episodes = 5000  # 최대 에피소드 수(수렴하면 그 전에 멈춤)
+    monitor = ConvergenceMonitor(env, agent, tolerance=0.05, window=50)
+    train(env, agent, episodes, convergence=monitor)
+    print(monitor.summary(episodes))
 
     env.render_v(agent.V)
\ No newline at end of file